@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_arena.py
+
+import argparse
+import importlib
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import chess_bitboard
+import chess_engine
+from chess_book import load_book, book_ply, BOOK_PATH
+from chess_bitboard import Position, START_FEN, move_promotion, move_to_uci, QUEEN, PAWN, ROOK
+
+# Modules qui forment une "version" du moteur (chargés ensemble)
+BUILD_MODULES = ("chess_eval", "chess_bitboard", "chess_tablebase", "chess_engine")
+
+# Partie déclarée nulle au-delà de ce nombre de demi-coups
+MAX_PLIES = 400
+
+
+def load_build(path):
+    """
+    Charge le moteur d'une autre copie du dépôt (dossier path) sans toucher
+    aux modules du dépôt courant: retourne ses modules (bitboard, engine).
+    Les deux versions doivent partager l'encodage des coups et les FEN.
+    """
+    path = os.path.abspath(path)
+    saved = {name: sys.modules.pop(name, None) for name in BUILD_MODULES}
+    sys.path.insert(0, path)
+    try:
+        bitboard = importlib.import_module("chess_bitboard")
+        engine = importlib.import_module("chess_engine")
+    finally:
+        sys.path.remove(path)
+        for name in BUILD_MODULES:
+            sys.modules.pop(name, None)
+            if saved[name] is not None:
+                sys.modules[name] = saved[name]
+    return bitboard, engine
+
+
+def find_move(position, uci, to_uci=move_to_uci):
+    # Coup légal de la position correspondant à la notation UCI
+    for move in position.generate_legal_moves():
+        if to_uci(move) == uci:
+            return move
+    raise ValueError(f"Coup illégal: {uci}")
+
+
+class ArenaPlayer:
+    """
+    Joueur sans interface: un niveau de AI_LEVELS (même logique que
+    ChessAIGame.choose_ai_move) avec le moteur du dépôt ou d'une autre
+    version. Les temps de réflexion sont multipliés par time_scale; book est
+    le chemin de la bibliothèque d'ouvertures (None: pas de bibliothèque).
+    """
+
+    def __init__(self, level, build=None, time_scale=1.0, tt_size_mb=8, book=None):
+        if build:
+            self.bitboard, self.engine = load_build(build)
+        else:
+            self.bitboard, self.engine = chess_bitboard, chess_engine
+        self.level = self.engine.AI_LEVELS[level]
+        self.time_scale = time_scale
+        self.tt = self.engine.TranspositionTable(tt_size_mb)
+        # Historique des coups gardé d'un coup à l'autre (absent des anciennes versions)
+        self.ordering = self.engine.MoveOrdering() if hasattr(self.engine, "MoveOrdering") else None
+        self.book = load_book(book) if book else None
+        self.position = None
+
+    def new_game(self, moves):
+        self.position = self.bitboard.Position.from_fen(START_FEN)
+        self.tt.clear()
+        if self.ordering is not None:
+            self.ordering.clear()
+        for uci in moves:
+            self.play(uci)
+
+    def play(self, uci):
+        self.position.make_move(find_move(self.position, uci, self.bitboard.move_to_uci))
+
+    def choose(self, rng):
+        position = self.position
+        to_uci = self.bitboard.move_to_uci
+        moves = position.generate_legal_moves()
+        # Comme dans le jeu: pas de sous-promotion hors recherche
+        simple = [m for m in moves if move_promotion(m) in (0, QUEEN)]
+        level = self.level
+        # Les niveaux d'une version sans bibliothèque n'ont pas book_depth
+        if self.book is not None and book_ply(position) < level.get("book_depth", 0):
+            move = self.book.probe(position, level["book_weighting"], rng)
+            if move:
+                return to_uci(move)
+        if rng.random() < level["random"]:
+            return to_uci(rng.choice(simple))
+        if level["strategy"] == "search":
+            low, high = level["think_time"]
+            options = {"ordering": self.ordering} if self.ordering is not None else {}
+            search = self.engine.Search(position, self.tt, **options)
+            move = search.think(low * self.time_scale, high * self.time_scale, level["depth"])
+            if move:
+                return to_uci(move)
+        else:
+            move = self.engine.best_capture(position, simple)
+            if move:
+                return to_uci(move)
+        return to_uci(rng.choice(simple))
+
+
+def insufficient_material(position):
+    # Ni pion, ni tour, ni dame, et au plus une pièce mineure par camp
+    for pieces in position.pieces:
+        if pieces[PAWN] or pieces[ROOK] or pieces[QUEEN]:
+            return False
+    return all(len(pieces) <= 2 for pieces in position.piece_lists)
+
+
+def adjudicate(position, keys, plies):
+    """
+    Résultat de la partie ("1-0", "0-1", "1/2-1/2") ou None si elle continue.
+    """
+    if not position.generate_legal_moves():
+        if position.in_check():
+            return "0-1" if position.side == chess_bitboard.WHITE else "1-0"
+        return "1/2-1/2"  # Pat
+    if (position.halfmove >= 100 or keys.count(position.key) >= 3
+            or insufficient_material(position) or plies >= MAX_PLIES):
+        return "1/2-1/2"
+    return None
+
+
+# Joueurs déjà créés dans ce processus (une table de transposition chacun),
+# par (joueur, couleur): la couleur ne compte que si les deux camps ont le
+# même joueur, qui a alors une instance par couleur
+_players = {}
+
+
+def _player(spec, settings, color=None):
+    if (spec, color) not in _players:
+        level, build = spec
+        _players[(spec, color)] = ArenaPlayer(level, build, settings["time_scale"], settings["hash"],
+                                              settings["book"])
+    return _players[(spec, color)]
+
+
+def play_game(task):
+    """
+    Joue une partie (dans un processus du groupe). task: (indice, ouverture
+    en UCI, joueur blanc, joueur noir, réglages); un joueur est (niveau, version).
+    Retourne (indice, résultat, coups joués en UCI).
+    """
+    index, opening, white, black, settings = task
+    rng = random.Random(settings["seed"] * 1000003 + index)
+    if white == black:
+        # Même joueur des deux côtés: une instance par couleur
+        players = (_player(white, settings, chess_bitboard.WHITE),
+                   _player(black, settings, chess_bitboard.BLACK))
+    else:
+        players = (_player(white, settings), _player(black, settings))
+    referee = Position.from_fen(START_FEN)
+    for uci in opening:
+        referee.make_move(find_move(referee, uci))
+    for player in players:
+        player.new_game(opening)
+    keys = [referee.key]
+    moves = list(opening)
+    while True:
+        result = adjudicate(referee, keys, len(moves))
+        if result:
+            return index, result, moves
+        uci = players[referee.side].choose(rng)
+        referee.make_move(find_move(referee, uci))
+        for player in players:
+            player.play(uci)
+        keys.append(referee.key)
+        moves.append(uci)
+
+
+def random_opening(rng, plies):
+    """
+    Ouverture aléatoire de plies demi-coups légaux (sans fin de partie).
+    """
+    while True:
+        position = Position.from_fen(START_FEN)
+        moves = []
+        for _ in range(plies):
+            legal = position.generate_legal_moves()
+            if not legal:
+                break
+            move = rng.choice(legal)
+            moves.append(move_to_uci(move))
+            position.make_move(move)
+        if len(moves) == plies and position.generate_legal_moves():
+            return moves
+
+
+def game_pgn(moves, result, white, black):
+    """
+    Partie au format PGN (coups en notation SAN), pour construire une
+    bibliothèque d'ouvertures avec chess_book.py.
+    """
+    position = Position.from_fen(START_FEN)
+    tokens = []
+    for ply, uci in enumerate(moves):
+        move = find_move(position, uci)
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        tokens.append(position.san(move))
+        position.make_move(move)
+    tokens.append(result)
+    lines = []
+    line = ""
+    for token in tokens:
+        if len(line) + len(token) >= 80:
+            lines.append(line.rstrip())
+            line = ""
+        line += token + " "
+    lines.append(line.rstrip())
+    return (f'[White "{white}"]\n[Black "{black}"]\n[Result "{result}"]\n\n'
+            + "\n".join(lines) + "\n\n")
+
+
+def elo_from_score(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return 400 * math.log10(score / (1 - score))
+
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Log-rapport de vraisemblance du SPRT (approximation trinomiale
+    normalisée) pour H1: elo = elo1 contre H0: elo = elo0.
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0
+    win_rate, draw_rate = wins / games, draws / games
+    score = win_rate + draw_rate / 2
+    variance = win_rate + draw_rate / 4 - score * score
+    if variance <= 0:
+        return 0.0
+    score0 = 1 / (1 + 10 ** (-elo0 / 400))
+    score1 = 1 / (1 + 10 ** (-elo1 / 400))
+    return (score1 - score0) * (2 * score - score0 - score1) / (2 * variance / games)
+
+
+def summary(wins, draws, losses, sprt=None):
+    """
+    Lignes de bilan: score, Elo avec intervalle à 95 %, état du SPRT.
+    """
+    games = wins + draws + losses
+    lines = [f"Parties: {games}  +{wins} ={draws} -{losses}"]
+    if not games:
+        return lines
+    score = (wins + draws / 2) / games
+    variance = (wins + draws / 4) / games - score * score
+    margin = 1.96 * math.sqrt(max(variance, 0) / games)
+    elo = elo_from_score(score)
+    low, high = elo_from_score(score - margin), elo_from_score(score + margin)
+    lines.append(f"Score: {score:.1%}  Elo: {elo:+.1f} (95 %: {low:+.1f} à {high:+.1f})")
+    if sprt:
+        elo0, elo1, alpha, beta = sprt
+        llr = sprt_llr(wins, draws, losses, elo0, elo1)
+        lower, upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+        state = "H1 acceptée" if llr >= upper else "H0 acceptée" if llr <= lower else "en cours"
+        lines.append(f"SPRT [{elo0}, {elo1}]: LLR {llr:.2f} ({lower:.2f}, {upper:.2f}) - {state}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Parties IA contre IA sans interface, en parallèle, avec bilan Elo / SPRT.")
+    parser.add_argument("--a", default="expert", help="niveau du joueur A (AI_LEVELS)")
+    parser.add_argument("--b", default="difficile", help="niveau du joueur B")
+    parser.add_argument("--build-a", help="dossier d'une autre version du moteur pour A")
+    parser.add_argument("--build-b", help="dossier d'une autre version du moteur pour B")
+    parser.add_argument("--games", type=int, default=100, help="nombre de parties (arrondi au pair)")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="nombre de processus (tous les cœurs par défaut)")
+    parser.add_argument("--time-scale", type=float, default=0.1,
+                        help="facteur appliqué aux temps de réflexion des niveaux")
+    parser.add_argument("--random-plies", type=int, default=8,
+                        help="demi-coups aléatoires d'ouverture (chaque ouverture est jouée avec les deux couleurs)")
+    parser.add_argument("--hash", type=int, default=8, help="table de transposition par joueur (Mo)")
+    parser.add_argument("--book", default=BOOK_PATH, help="bibliothèque d'ouvertures des deux joueurs")
+    parser.add_argument("--no-book", action="store_true", help="jouer sans bibliothèque d'ouvertures")
+    parser.add_argument("--sprt", help="elo0,elo1: arrêt dès que le SPRT conclut (alpha = beta = 0.05)")
+    parser.add_argument("--pgn", help="enregistre les parties dans ce fichier PGN")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for level in (args.a, args.b):
+        if level not in chess_engine.AI_LEVELS:
+            parser.error(f"niveau inconnu: {level} ({', '.join(chess_engine.AI_LEVELS)})")
+    sprt = None
+    if args.sprt:
+        elo0, elo1 = (float(value) for value in args.sprt.split(","))
+        sprt = (elo0, elo1, 0.05, 0.05)
+        lower, upper = math.log(0.05 / 0.95), math.log(0.95 / 0.05)
+
+    settings = {"time_scale": args.time_scale, "hash": args.hash, "seed": args.seed,
+                "book": None if args.no_book else args.book}
+    player_a = (args.a, args.build_a)
+    player_b = (args.b, args.build_b)
+    rng = random.Random(args.seed)
+
+    def tasks():
+        # Chaque ouverture est jouée deux fois, couleurs inversées
+        for pair in range((args.games + 1) // 2):
+            opening = random_opening(rng, args.random_plies)
+            yield (2 * pair, opening, player_a, player_b, settings)
+            yield (2 * pair + 1, opening, player_b, player_a, settings)
+
+    wins = draws = losses = 0
+    start = time.perf_counter()
+    print(f"A = {args.a} ({args.build_a or 'dépôt courant'}), "
+          f"B = {args.b} ({args.build_b or 'dépôt courant'}), {args.concurrency} processus")
+    # Noms par rôle: A et B peuvent avoir le même niveau et la même version
+    names = (f"A {args.a}", f"B {args.b}")
+    pgn = open(args.pgn, "w") if args.pgn else None
+    with multiprocessing.Pool(args.concurrency) as pool:
+        for index, result, moves in pool.imap_unordered(play_game, tasks()):
+            if pgn:
+                white, black = names if index % 2 == 0 else names[::-1]
+                pgn.write(game_pgn(moves, result, white, black))
+            # Résultat du point de vue de A (blanc aux parties d'indice pair)
+            if result == "1/2-1/2":
+                draws += 1
+            elif (result == "1-0") == (index % 2 == 0):
+                wins += 1
+            else:
+                losses += 1
+            games = wins + draws + losses
+            if games % 10 == 0:
+                print(f"{games} parties ({time.perf_counter() - start:.0f} s): "
+                      f"+{wins} ={draws} -{losses}")
+            if sprt:
+                llr = sprt_llr(wins, draws, losses, sprt[0], sprt[1])
+                if llr <= lower or llr >= upper:
+                    pool.terminate()
+                    break
+    if pgn:
+        pgn.close()
+    for line in summary(wins, draws, losses, sprt):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_bench.py
+
+import argparse
+import json
+import sys
+import time
+import zlib
+
+from chess_bitboard import Position, move_to_uci
+from chess_engine import TranspositionTable, Search
+from chess_worker import SearchWorker
+
+# Positions de milieu de partie et de finale, cherchées à profondeur fixe
+# pour que le nombre de nœuds (et donc la signature) soit reproductible
+BENCH_POSITIONS = (
+    ("milieu", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10"),
+    ("milieu", "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+    ("milieu", "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19"),
+    ("milieu", "rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14"),
+    ("milieu", "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14"),
+    ("milieu", "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15"),
+    ("milieu", "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13"),
+    ("finale", "8/8/8/8/5kp1/P7/8/1K1N4 w - - 0 1"),
+    ("finale", "8/8/8/5N2/8/p7/8/2NK3k w - - 0 1"),
+    ("finale", "8/3k4/8/8/8/4B3/4KB2/2B5 w - - 0 1"),
+    ("finale", "6k1/6p1/8/6KQ/1r6/q2b4/8/8 w - - 0 32"),
+    ("finale", "8/8/1p1r1k2/p1pPN1p1/P3KnP1/1P6/8/3R4 b - - 0 1"),
+    ("finale", "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1"),
+    ("finale", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+)
+
+
+def bench_position(fen, depth, tt_size_mb):
+    """
+    Cherche une position jusqu'à depth avec une table de transposition
+    neuve et retourne les mesures sous forme de dictionnaire.
+    """
+    search = Search(Position.from_fen(fen), TranspositionTable(tt_size_mb))
+    start = time.perf_counter()
+    depth_times = []
+    for _ in search.iterate(depth):
+        depth_times.append(round(time.perf_counter() - start, 4))
+    elapsed = time.perf_counter() - start
+    return {
+        "fen": fen,
+        "depth": search.depth,
+        "nodes": search.nodes,
+        "time": round(elapsed, 4),
+        "nps": int(search.nodes / elapsed) if elapsed > 0 else 0,
+        "time_to_depth": depth_times,
+        "tt_hit_rate": round(search.tt.hit_rate(), 4),
+        "tt_usage": round(search.tt.usage(), 4),
+        "first_move_cutoff_rate": round(search.ordering.first_move_cutoff_rate(), 4),
+        "best_move": move_to_uci(search.best_move) if search.best_move else None,
+        "score": search.best_score,
+    }
+
+
+def signature(results):
+    # Somme de contrôle des résultats déterministes (nœuds, coup, score):
+    # elle ne change que si l'arbre de recherche change, pas avec la vitesse
+    text = ";".join(f"{r['nodes']},{r['best_move']},{r['score']}" for r in results)
+    return f"{zlib.crc32(text.encode()):08x}"
+
+
+def run_bench(depth=4, tt_size_mb=16, log=None):
+    """
+    Lance le benchmark sur toutes les positions et retourne le rapport.
+    """
+    results = []
+    for phase, fen in BENCH_POSITIONS:
+        result = bench_position(fen, depth, tt_size_mb)
+        result["phase"] = phase
+        results.append(result)
+        if log:
+            log(f"{fen} | prof. {result['depth']} | {result['nodes']} nœuds | "
+                f"{result['nps']} nœuds/s | TT {result['tt_hit_rate']:.0%} "
+                f"(remplie à {result['tt_usage']:.1%}) | "
+                f"coupure 1er coup {result['first_move_cutoff_rate']:.0%} | {result['best_move']}")
+    nodes = sum(r["nodes"] for r in results)
+    elapsed = sum(r["time"] for r in results)
+    return {
+        "depth": depth,
+        "tt_size_mb": tt_size_mb,
+        "positions": results,
+        "nodes": nodes,
+        "time": round(elapsed, 4),
+        "nps": int(nodes / elapsed) if elapsed > 0 else 0,
+        "signature": signature(results),
+    }
+
+
+def run_speedup(depth, thread_counts, tt_size_mb=16, log=None):
+    """
+    Temps pour atteindre depth sur toutes les positions avec la recherche
+    parallèle, pour chaque nombre de processus, et accélération par rapport
+    au premier nombre de la liste. Les processus sont lancés avant de
+    démarrer le chronomètre, avec une table neuve pour chaque position.
+    """
+    rows = []
+    for threads in thread_counts:
+        elapsed = 0.0
+        nodes = 0
+        for _, fen in BENCH_POSITIONS:
+            worker = SearchWorker(tt_size_mb, threads)
+            worker.start()
+            start = time.perf_counter()
+            result = worker.search(Position.from_fen(fen), float("inf"), float("inf"), depth)
+            elapsed += time.perf_counter() - start
+            nodes += result.nodes
+            worker.close()
+        row = {
+            "threads": threads,
+            "time": round(elapsed, 4),
+            "nodes": nodes,
+            "nps": int(nodes / elapsed) if elapsed > 0 else 0,
+            "speedup": round(rows[0]["time"] / elapsed, 2) if rows and elapsed > 0 else 1.0,
+        }
+        rows.append(row)
+        if log:
+            log(f"{threads} processus | {row['time']:.2f} s | {nodes} nœuds | "
+                f"{row['nps']} nœuds/s | accélération x{row['speedup']}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la recherche: nœuds, nœuds/s, temps par profondeur (JSON).")
+    parser.add_argument("--depth", type=int, default=4, help="profondeur de recherche (4 par défaut)")
+    parser.add_argument("--hash", type=int, default=16, help="taille de la table de transposition en Mo")
+    parser.add_argument("--output", help="fichier JSON de sortie (sortie standard par défaut)")
+    parser.add_argument("--threads",
+                        help="mesure aussi la recherche parallèle, ex. 1,2,4 (accélération par nombre de processus)")
+    args = parser.parse_args(argv)
+
+    # Le suivi lisible part sur stderr pour laisser stdout au JSON
+    log = lambda line: print(line, file=sys.stderr)
+    report = run_bench(args.depth, args.hash, log)
+    print(f"Total: {report['nodes']} nœuds en {report['time']:.2f} s ({report['nps']} nœuds/s), "
+          f"signature {report['signature']}", file=sys.stderr)
+    if args.threads:
+        thread_counts = [int(count) for count in args.threads.split(",")]
+        report["speedup"] = run_speedup(args.depth, thread_counts, args.hash, log)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
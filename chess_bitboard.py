@@ -0,0 +1,1078 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_bitboard.py
+
+import random
+import struct
+
+from chess_eval import PSQ_MG, PSQ_EG, PHASE_WEIGHTS
+
+# Représentation de l'échiquier par bitboards (entiers de 64 bits).
+# Convention des cases: a1 = 0, b1 = 1, ..., h8 = 63 (rangée * 8 + colonne).
+# Le plateau graphique utilise (row, col) avec row = 0 pour la 8e rangée,
+# les fonctions square_of / row_col font la conversion.
+
+# Couleurs
+WHITE = 0
+BLACK = 1
+COLOR_NAMES = ("white", "black")
+
+# Types de pièces (0 sert aussi de "pas de promotion" dans l'encodage des coups)
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+PIECE_NAMES = ("pawn", "knight", "bishop", "rook", "queen", "king")
+
+BB_ALL = 0xFFFFFFFFFFFFFFFF
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_3 = RANK_1 << 16
+RANK_6 = RANK_1 << 40
+RANK_8 = RANK_1 << 56
+
+# Droits de roque (un bit par roque)
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Lettres des pièces en notation FEN, dans l'ordre de PIECE_NAMES
+FEN_PIECES = "pnbrqk"
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Encodage binaire compact d'une position (Position.pack), 32 octets:
+#   Q    occupation (bit n = case n occupée)
+#   16s  une pièce par demi-octet (1 + couleur * 6 + type), dans l'ordre des
+#        cases occupées, demi-octet de poids faible en premier
+#   B    trait (bit 0) et droits de roque (bits 1-4)
+#   b    case de prise en passant (-1 si aucune)
+#   H    compteur de demi-coups (règle des 50 coups)
+#   I    numéro du coup
+PACKED_FORMAT = "<Q16sBbHI"
+PACKED_SIZE = struct.calcsize(PACKED_FORMAT)
+
+
+def square_of(row, col):
+    # Convertit une case (row, col) du plateau graphique en indice 0..63
+    return (7 - row) * 8 + col
+
+
+def row_col(sq):
+    # Conversion inverse: indice 0..63 vers (row, col)
+    return (7 - (sq >> 3), sq & 7)
+
+
+# Encodage d'un coup dans un entier:
+#   bits 0-5   case de départ
+#   bits 6-11  case d'arrivée
+#   bits 12-14 pièce de promotion (0 = pas de promotion)
+def encode_move(frm, to, promotion=0):
+    return frm | (to << 6) | (promotion << 12)
+
+
+def move_from(move):
+    return move & 63
+
+
+def move_to(move):
+    return (move >> 6) & 63
+
+
+def move_promotion(move):
+    return (move >> 12) & 7
+
+
+# Pièces de promotion, la dame en premier
+PROMOTION_FLAGS = (QUEEN << 12, KNIGHT << 12, ROOK << 12, BISHOP << 12)
+
+
+def square_name(sq):
+    # Nom algébrique d'une case: 0 -> "a1", 63 -> "h8"
+    return "abcdefgh"[sq & 7] + str((sq >> 3) + 1)
+
+
+def parse_square(name):
+    # Conversion inverse: "e3" -> 20
+    file, rank = "abcdefgh".index(name[0]), int(name[1]) - 1
+    if not 0 <= rank < 8:
+        raise ValueError(f"Case invalide: {name}")
+    return rank * 8 + file
+
+
+def move_to_uci(move):
+    # Notation UCI: e2e4, e7e8q pour une promotion
+    promotion = (move >> 12) & 7
+    return (square_name(move & 63) + square_name((move >> 6) & 63)
+            + (FEN_PIECES[promotion] if promotion else ""))
+
+
+def _step_attacks(deltas):
+    # Table des attaques "à un pas" (cavalier, roi) pour chaque case
+    table = []
+    for sq in range(64):
+        rank, file = sq >> 3, sq & 7
+        bb = 0
+        for dr, df in deltas:
+            r, f = rank + dr, file + df
+            if 0 <= r < 8 and 0 <= f < 8:
+                bb |= 1 << (r * 8 + f)
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _step_attacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                                (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _step_attacks([(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                              (0, 1), (1, -1), (1, 0), (1, 1)])
+PAWN_ATTACKS = (_step_attacks([(1, -1), (1, 1)]),     # Pions blancs
+                _step_attacks([(-1, -1), (-1, 1)]))   # Pions noirs
+
+
+def _ray_attacks(sq, occ, deltas):
+    # Attaques glissantes calculées case par case (utilisé pour remplir les tables)
+    rank, file = sq >> 3, sq & 7
+    bb = 0
+    for dr, df in deltas:
+        r, f = rank + dr, file + df
+        while 0 <= r < 8 and 0 <= f < 8:
+            bit = 1 << (r * 8 + f)
+            bb |= bit
+            if occ & bit:
+                break
+            r, f = r + dr, f + df
+    return bb
+
+
+def _relevant_mask(sq, deltas):
+    # Cases de la ligne dont l'occupation influence les attaques (bords exclus)
+    rank, file = sq >> 3, sq & 7
+    bb = 0
+    for dr, df in deltas:
+        r, f = rank + dr, file + df
+        while 0 <= r + dr < 8 and 0 <= f + df < 8:
+            bb |= 1 << (r * 8 + f)
+            r, f = r + dr, f + df
+    return bb
+
+
+def _line_tables(deltas):
+    # Pour chaque case: masque de la ligne et table occupation -> attaques.
+    # Le dictionnaire joue le rôle du hachage "magique": l'occupation masquée
+    # sert directement de clé, sans multiplication ni décalage.
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = _relevant_mask(sq, deltas)
+        table = {}
+        subset = 0
+        while True:
+            table[subset] = _ray_attacks(sq, subset, deltas)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+# Une table par ligne (rangée, colonne, diagonale, anti-diagonale): au plus
+# 64 entrées par case, soit quelques milliers d'entrées au total.
+RANK_MASKS, RANK_TABLES = _line_tables([(0, -1), (0, 1)])
+FILE_MASKS, FILE_TABLES = _line_tables([(-1, 0), (1, 0)])
+DIAG_MASKS, DIAG_TABLES = _line_tables([(-1, -1), (1, 1)])
+ANTI_MASKS, ANTI_TABLES = _line_tables([(-1, 1), (1, -1)])
+
+
+def rook_attacks(sq, occ):
+    return (RANK_TABLES[sq][occ & RANK_MASKS[sq]]
+            | FILE_TABLES[sq][occ & FILE_MASKS[sq]])
+
+
+def bishop_attacks(sq, occ):
+    return (DIAG_TABLES[sq][occ & DIAG_MASKS[sq]]
+            | ANTI_TABLES[sq][occ & ANTI_MASKS[sq]])
+
+
+def queen_attacks(sq, occ):
+    return rook_attacks(sq, occ) | bishop_attacks(sq, occ)
+
+
+def piece_attacks(ptype, color, sq, occ):
+    """
+    Retourne le bitboard des cases attaquées par une pièce posée sur sq.
+    """
+    if ptype == PAWN:
+        return PAWN_ATTACKS[color][sq]
+    if ptype == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    if ptype == BISHOP:
+        return bishop_attacks(sq, occ)
+    if ptype == ROOK:
+        return rook_attacks(sq, occ)
+    if ptype == QUEEN:
+        return queen_attacks(sq, occ)
+    return KING_ATTACKS[sq]
+
+
+def _zobrist_keys():
+    # Clés de Zobrist tirées avec une graine fixe, pour que les hachages
+    # soient reproductibles d'une exécution à l'autre
+    rng = random.Random(0x5EED)
+    pieces = [[[rng.getrandbits(64) for _ in range(64)] for _ in range(6)]
+              for _ in range(2)]
+    side = rng.getrandbits(64)
+    # Une clé par droit de roque, combinées en une table indexée par les
+    # 4 bits de droits; une clé par colonne de prise en passant
+    rights = [rng.getrandbits(64) for _ in range(4)]
+    castling = []
+    for mask in range(16):
+        key = 0
+        for bit in range(4):
+            if mask >> bit & 1:
+                key ^= rights[bit]
+        castling.append(key)
+    en_passant = [rng.getrandbits(64) for _ in range(8)]
+    return pieces, side, castling, en_passant
+
+
+ZOBRIST_PIECES, ZOBRIST_SIDE, ZOBRIST_CASTLING, ZOBRIST_EP = _zobrist_keys()
+
+
+def _castling_masks():
+    # Droits conservés quand une pièce part de (ou arrive sur) chaque case:
+    # un roi ou une tour qui bouge, une tour prise font perdre le roque
+    masks = [ALL_CASTLING] * 64
+    masks[4] ^= WHITE_KINGSIDE | WHITE_QUEENSIDE
+    masks[7] ^= WHITE_KINGSIDE
+    masks[0] ^= WHITE_QUEENSIDE
+    masks[60] ^= BLACK_KINGSIDE | BLACK_QUEENSIDE
+    masks[63] ^= BLACK_KINGSIDE
+    masks[56] ^= BLACK_QUEENSIDE
+    return masks
+
+
+CASTLING_MASKS = _castling_masks()
+
+# Roques de chaque camp: (droit, départ du roi, arrivée du roi, départ de la
+# tour, arrivée de la tour, cases à libérer, cases que le roi traverse)
+CASTLES = (
+    ((WHITE_KINGSIDE, 4, 6, 7, 5, 0x60, 0x60),
+     (WHITE_QUEENSIDE, 4, 2, 0, 3, 0x0E, 0x0C)),
+    ((BLACK_KINGSIDE, 60, 62, 63, 61, 0x60 << 56, 0x60 << 56),
+     (BLACK_QUEENSIDE, 60, 58, 56, 59, 0x0E << 56, 0x0C << 56)),
+)
+# Roque identifié par la case d'arrivée du roi
+CASTLE_BY_TARGET = {castle[2]: castle for castles in CASTLES for castle in castles}
+
+
+def _between_table():
+    # BETWEEN[a][b]: cases strictement entre a et b si elles sont alignées
+    table = [[0] * 64 for _ in range(64)]
+    for sq in range(64):
+        rank, file = sq >> 3, sq & 7
+        for dr, df in [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                       (0, 1), (1, -1), (1, 0), (1, 1)]:
+            r, f = rank + dr, file + df
+            ray = 0
+            while 0 <= r < 8 and 0 <= f < 8:
+                table[sq][r * 8 + f] = ray
+                ray |= 1 << (r * 8 + f)
+                r, f = r + dr, f + df
+    return table
+
+
+BETWEEN = _between_table()
+
+
+def move_targets(moves):
+    """
+    Cases d'arrivée (row, col) d'une liste de coups, sans doublon (les
+    quatre promotions arrivent sur la même case).
+    """
+    targets = []
+    for move in moves:
+        target = row_col((move >> 6) & 63)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def iter_bits(bb):
+    # Parcourt les indices des bits à 1 d'un bitboard
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+class Position:
+    """
+    Position d'échecs sous forme de bitboards: un entier de 64 bits par type
+    de pièce et par couleur, plus l'occupation de chaque camp.
+    """
+
+    def __init__(self):
+        self.pieces = [[0] * 6, [0] * 6]
+        self.occupied = [0, 0]
+        # Tableau case -> (couleur, type) pour retrouver rapidement une pièce
+        self.squares = [None] * 64
+        self.side = WHITE
+        # Carte des attaques: cases attaquées par la pièce posée sur chaque
+        # case, et union par couleur. Mise à jour incrémentale à chaque coup.
+        self.attack_from = [0] * 64
+        self.attacks = [0, 0]
+        # Listes de pièces par couleur (cases occupées) et case des rois,
+        # pour ne parcourir que les pièces qui existent encore
+        self.piece_lists = [[], []]
+        self.list_index = [-1] * 64
+        self.kings = [-1, -1]
+        # Pile d'annulation: un tuple compact par coup joué
+        self.history = []
+        # Droits de roque, case de prise en passant (-1 si aucune, et seulement
+        # si un pion adverse peut réellement prendre), compteurs de coups
+        self.castling = 0
+        self.ep = -1
+        self.halfmove = 0
+        self.fullmove = 1
+        # Clé de Zobrist de la position, mise à jour à chaque coup
+        self.key = 0
+        # Termes d'évaluation incrémentaux (voir chess_eval): scores pièce-case
+        # milieu de partie / finale du point de vue des blancs, et phase de jeu
+        self.mg = 0
+        self.eg = 0
+        self.phase = 0
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Construit une position à partir d'une chaîne FEN. Lève ValueError si
+        la chaîne est mal formée.
+        """
+        fields = fen.split()
+        rows = fields[0].split("/") if fields else []
+        if len(rows) != 8 or len(fields) > 6:
+            raise ValueError(f"FEN invalide: {fen}")
+        position = cls()
+        try:
+            for row, text in enumerate(rows):
+                col = 0
+                for char in text:
+                    if char.isdigit():
+                        col += int(char)
+                        continue
+                    if col > 7:
+                        raise ValueError(f"FEN invalide: {fen}")
+                    color = WHITE if char.isupper() else BLACK
+                    position.put_piece(color, FEN_PIECES.index(char.lower()), square_of(row, col))
+                    col += 1
+                if col != 8:
+                    raise ValueError(f"FEN invalide: {fen}")
+            position.side = "wb".index(fields[1] if len(fields) > 1 else "w")
+            for char in fields[2] if len(fields) > 2 else "-":
+                if char != "-":
+                    position.castling |= 1 << "KQkq".index(char)
+            if len(fields) > 3 and fields[3] != "-":
+                position.ep = parse_square(fields[3])
+            if len(fields) > 4:
+                position.halfmove = int(fields[4])
+            if len(fields) > 5:
+                position.fullmove = int(fields[5])
+        except (ValueError, IndexError):
+            raise ValueError(f"FEN invalide: {fen}") from None
+        position._finish_setup()
+        return position
+
+    def fen(self):
+        """
+        Chaîne FEN de la position (la prise en passant n'est indiquée que si
+        elle est jouable, comme dans la position).
+        """
+        rows = []
+        for row in range(8):
+            text = ""
+            empty = 0
+            for col in range(8):
+                entry = self.squares[square_of(row, col)]
+                if entry is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                char = FEN_PIECES[entry[1]]
+                text += char.upper() if entry[0] == WHITE else char
+            rows.append(text + (str(empty) if empty else ""))
+        castling = "".join(char for bit, char in enumerate("KQkq") if self.castling >> bit & 1)
+        return (f"{'/'.join(rows)} {'wb'[self.side]} {castling or '-'} "
+                f"{square_name(self.ep) if self.ep >= 0 else '-'} {self.halfmove} {self.fullmove}")
+
+    def pack(self):
+        """
+        Encodage binaire de la position sur PACKED_SIZE (32) octets, pour
+        l'envoyer à un autre processus ou la stocker (voir PACKED_FORMAT).
+        L'historique des coups n'est pas transmis.
+        """
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        codes = [1 + color * 6 + ptype for color, ptype in
+                 (self.squares[sq] for sq in iter_bits(occupied))]
+        if len(codes) > 32:
+            raise ValueError("Plus de 32 pièces: position impossible à encoder")
+        codes += [0] * (32 - len(codes))
+        nibbles = bytes(codes[i] | codes[i + 1] << 4 for i in range(0, 32, 2))
+        return struct.pack(PACKED_FORMAT, occupied, nibbles, self.side | self.castling << 1,
+                           self.ep, min(self.halfmove, 0xFFFF), self.fullmove)
+
+    @classmethod
+    def unpack(cls, data):
+        """
+        Reconstruit une position à partir de Position.pack(). Lève ValueError
+        si les données ne sont pas un encodage valide.
+        """
+        try:
+            occupied, nibbles, flags, ep, halfmove, fullmove = struct.unpack(PACKED_FORMAT, data)
+        except struct.error:
+            raise ValueError("Position binaire invalide") from None
+        # Au plus 32 pièces (un demi-octet chacune)
+        if bin(occupied).count("1") > 32:
+            raise ValueError("Position binaire invalide: plus de 32 pièces")
+        if not -1 <= ep < 64:
+            raise ValueError("Position binaire invalide: case de prise en passant hors de l'échiquier")
+        position = cls()
+        for index, sq in enumerate(iter_bits(occupied)):
+            code = nibbles[index >> 1] >> (index & 1) * 4 & 15
+            if not 1 <= code <= 12:
+                raise ValueError("Position binaire invalide")
+            position.put_piece((code - 1) // 6, (code - 1) % 6, sq)
+        position.side = flags & 1
+        position.castling = flags >> 1 & ALL_CASTLING
+        position.ep = ep
+        position.halfmove = halfmove
+        position.fullmove = fullmove
+        position._finish_setup()
+        return position
+
+    def _finish_setup(self):
+        # Ne garder que les droits de roque dont le roi et la tour sont en
+        # place, et la prise en passant seulement si un pion peut la jouer
+        for color, castles in enumerate(CASTLES):
+            for right, king_from, _, rook_from, _, _, _ in castles:
+                if self.squares[king_from] != (color, KING) or self.squares[rook_from] != (color, ROOK):
+                    self.castling &= ~right
+        if self.ep >= 0:
+            # La case doit être derrière un pion adverse qui vient d'avancer
+            # de deux cases: 6e rangée aux blancs de jouer, 3e aux noirs
+            behind = self.ep - 8 if self.side == WHITE else self.ep + 8
+            if (self.ep >> 3 != (5 if self.side == WHITE else 2)
+                    or self.squares[self.ep] is not None
+                    or self.squares[behind] != (self.side ^ 1, PAWN)
+                    or not PAWN_ATTACKS[self.side ^ 1][self.ep] & self.pieces[self.side][PAWN]):
+                self.ep = -1
+        self.key = self.compute_key()
+        self.refresh_attacks()
+
+    def put_piece(self, color, ptype, sq):
+        bit = 1 << sq
+        self.pieces[color][ptype] |= bit
+        self.occupied[color] |= bit
+        self.squares[sq] = (color, ptype)
+        self.key ^= ZOBRIST_PIECES[color][ptype][sq]
+        self.mg += PSQ_MG[color][ptype][sq]
+        self.eg += PSQ_EG[color][ptype][sq]
+        self.phase += PHASE_WEIGHTS[ptype]
+        pieces = self.piece_lists[color]
+        self.list_index[sq] = len(pieces)
+        pieces.append(sq)
+        if ptype == KING:
+            self.kings[color] = sq
+
+    def remove_piece(self, sq):
+        color, ptype = self.squares[sq]
+        mask = ~(1 << sq)
+        self.pieces[color][ptype] &= mask
+        self.occupied[color] &= mask
+        self.squares[sq] = None
+        self.key ^= ZOBRIST_PIECES[color][ptype][sq]
+        self.mg -= PSQ_MG[color][ptype][sq]
+        self.eg -= PSQ_EG[color][ptype][sq]
+        self.phase -= PHASE_WEIGHTS[ptype]
+        # Retrait en O(1): la dernière pièce de la liste prend la place libérée
+        pieces = self.piece_lists[color]
+        index = self.list_index[sq]
+        last = pieces.pop()
+        if last != sq:
+            pieces[index] = last
+            self.list_index[last] = index
+        self.list_index[sq] = -1
+        if ptype == KING:
+            self.kings[color] = -1
+
+    def _relocate(self, frm, to, new_ptype):
+        # Déplace une pièce vers une case vide en gardant son rang dans la
+        # liste de pièces; new_ptype diffère du type d'origine en cas de promotion
+        color, ptype = self.squares[frm]
+        frm_bit, to_bit = 1 << frm, 1 << to
+        bbs = self.pieces[color]
+        bbs[ptype] &= ~frm_bit
+        bbs[new_ptype] |= to_bit
+        self.occupied[color] ^= frm_bit | to_bit
+        self.squares[frm] = None
+        self.squares[to] = (color, new_ptype)
+        self.key ^= ZOBRIST_PIECES[color][ptype][frm] ^ ZOBRIST_PIECES[color][new_ptype][to]
+        self.mg += PSQ_MG[color][new_ptype][to] - PSQ_MG[color][ptype][frm]
+        self.eg += PSQ_EG[color][new_ptype][to] - PSQ_EG[color][ptype][frm]
+        self.phase += PHASE_WEIGHTS[new_ptype] - PHASE_WEIGHTS[ptype]
+        index = self.list_index[frm]
+        self.piece_lists[color][index] = to
+        self.list_index[to] = index
+        self.list_index[frm] = -1
+        if ptype == KING:
+            self.kings[color] = to
+
+    def castle_of(self, move):
+        """
+        Roque joué par move (tuple de CASTLES), ou None: un déplacement du
+        roi de deux colonnes depuis sa case d'origine, avec le droit associé
+        et les cases entre le roi et la tour libres. Sinon (coup "libre"),
+        c'est un simple déplacement du roi.
+        """
+        frm, to = move & 63, (move >> 6) & 63
+        if to - frm not in (2, -2):
+            return None
+        castle = CASTLE_BY_TARGET.get(to)
+        if castle is None or castle[1] != frm or self.squares[frm] is None or self.squares[frm][1] != KING:
+            return None
+        if (self.occupied[WHITE] | self.occupied[BLACK]) & castle[5]:
+            return None
+        return castle if self.castling & castle[0] else None
+
+    def en_passant_square(self, move):
+        """
+        Case du pion pris en passant par move, ou -1 si ce n'est pas une
+        prise en passant.
+        """
+        frm, to = move & 63, (move >> 6) & 63
+        entry = self.squares[frm]
+        if to != self.ep or entry is None or entry[1] != PAWN or (frm - to) & 7 == 0:
+            return -1
+        return to - 8 if entry[0] == WHITE else to + 8
+
+    def make_move(self, move):
+        """
+        Joue un coup (éventuellement "libre", hors règles) et passe le trait.
+        Les informations nécessaires pour l'annuler sont empilées dans
+        self.history (pièce prise, type d'origine de la pièce jouée, droits
+        de roque, prise en passant, compteur et clé d'avant le coup).
+        """
+        frm, to, promotion = move & 63, (move >> 6) & 63, (move >> 12) & 7
+        color, ptype = self.squares[frm]
+        captured = self.squares[to]
+        changed = (1 << frm) | (1 << to)
+        ep_capture = self.en_passant_square(move) if ptype == PAWN else -1
+        castle = self.castle_of(move) if ptype == KING else None
+        if ep_capture >= 0:
+            captured = self.squares[ep_capture]
+        self.history.append((move, captured, ptype, self.castling, self.ep,
+                             self.halfmove, self.key))
+        if ep_capture >= 0:
+            self.remove_piece(ep_capture)
+            changed |= 1 << ep_capture
+        elif captured is not None:
+            self.remove_piece(to)
+        self._relocate(frm, to, promotion if promotion else ptype)
+        if castle is not None:
+            self._relocate(castle[3], castle[4], ROOK)
+            changed |= (1 << castle[3]) | (1 << castle[4])
+        key = self.key ^ ZOBRIST_SIDE
+        if self.ep >= 0:
+            key ^= ZOBRIST_EP[self.ep & 7]
+            self.ep = -1
+        rights = self.castling & CASTLING_MASKS[frm] & CASTLING_MASKS[to]
+        if rights != self.castling:
+            key ^= ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_CASTLING[rights]
+            self.castling = rights
+        if ptype == PAWN and to - frm in (16, -16):
+            # Prise en passant possible au coup suivant seulement si un pion
+            # adverse est à côté de la case d'arrivée
+            ep = (frm + to) >> 1
+            if PAWN_ATTACKS[color][ep] & self.pieces[color ^ 1][PAWN]:
+                self.ep = ep
+                key ^= ZOBRIST_EP[ep & 7]
+        self.halfmove = 0 if ptype == PAWN or captured is not None else self.halfmove + 1
+        if self.side == BLACK:
+            self.fullmove += 1
+        self.side ^= 1
+        self.key = key
+        self._update_attacks(changed)
+
+    def unmake_move(self):
+        """
+        Annule le dernier coup joué par make_move et le retourne.
+        """
+        move, captured, ptype, castling, ep, halfmove, key = self.history.pop()
+        frm, to = move & 63, (move >> 6) & 63
+        changed = (1 << frm) | (1 << to)
+        self.side ^= 1
+        if self.side == BLACK:
+            self.fullmove -= 1
+        self._relocate(to, frm, ptype)
+        if ptype == KING:
+            # Roque: droit présent avant le coup et coin de la tour vidé par
+            # le coup (un simple déplacement du roi laisse la tour en place)
+            castle = CASTLE_BY_TARGET.get(to)
+            if (castle is not None and castle[1] == frm and castling & castle[0]
+                    and self.squares[castle[3]] is None):
+                self._relocate(castle[4], castle[3], ROOK)
+                changed |= (1 << castle[3]) | (1 << castle[4])
+        if captured is not None:
+            sq = to
+            if ptype == PAWN and to == ep:
+                # Prise en passant: le pion pris était à côté de la case d'arrivée
+                sq = to + 8 if captured[0] == WHITE else to - 8
+                changed |= 1 << sq
+            self.put_piece(captured[0], captured[1], sq)
+        self.castling = castling
+        self.ep = ep
+        self.halfmove = halfmove
+        self.key = key
+        self._update_attacks(changed)
+        return move
+
+    def compute_key(self):
+        """
+        Calcule la clé de Zobrist à partir de zéro (la clé self.key est
+        normalement tenue à jour de façon incrémentale).
+        """
+        key = ZOBRIST_SIDE if self.side == BLACK else 0
+        key ^= ZOBRIST_CASTLING[self.castling]
+        if self.ep >= 0:
+            key ^= ZOBRIST_EP[self.ep & 7]
+        for sq, entry in enumerate(self.squares):
+            if entry is not None:
+                key ^= ZOBRIST_PIECES[entry[0]][entry[1]][sq]
+        return key
+
+    def refresh_attacks(self):
+        """
+        Recalcule entièrement la carte des attaques (construction initiale).
+        """
+        occ = self.occupied[WHITE] | self.occupied[BLACK]
+        attack_from = self.attack_from = [0] * 64
+        for pieces in self.piece_lists:
+            for sq in pieces:
+                color, ptype = self.squares[sq]
+                attack_from[sq] = piece_attacks(ptype, color, sq, occ)
+        self._merge_attacks()
+
+    def _update_attacks(self, changed):
+        # Seules changent: les pièces des cases touchées par le coup (bitboard
+        # changed: départ, arrivée, tour du roque, pion pris en passant) et
+        # les pièces glissantes dont un rayon traverse l'une de ces cases.
+        occ = self.occupied[WHITE] | self.occupied[BLACK]
+        attack_from = self.attack_from
+        squares = self.squares
+        touched = changed
+        while touched:
+            low = touched & -touched
+            sq = low.bit_length() - 1
+            touched ^= low
+            entry = squares[sq]
+            if entry is None:
+                attack_from[sq] = 0
+            else:
+                attack_from[sq] = piece_attacks(entry[1], entry[0], sq, occ)
+        white, black = self.pieces
+        sliders = (white[BISHOP] | white[ROOK] | white[QUEEN]
+                   | black[BISHOP] | black[ROOK] | black[QUEEN]) & ~changed
+        while sliders:
+            low = sliders & -sliders
+            sq = low.bit_length() - 1
+            sliders ^= low
+            if attack_from[sq] & changed:
+                entry = squares[sq]
+                attack_from[sq] = piece_attacks(entry[1], entry[0], sq, occ)
+        self._merge_attacks()
+
+    def _merge_attacks(self):
+        attack_from = self.attack_from
+        for color in (WHITE, BLACK):
+            union = 0
+            for sq in self.piece_lists[color]:
+                union |= attack_from[sq]
+            self.attacks[color] = union
+
+    def king_square(self, color):
+        # Case du roi (-1 s'il n'y en a pas, possible en mode libre)
+        return self.kings[color]
+
+    def piece_squares(self, color):
+        """
+        Cases occupées par les pièces de la couleur donnée (liste de pièces).
+        """
+        return list(self.piece_lists[color])
+
+    def is_attacked(self, sq, by_color):
+        """
+        Indique si la case sq est attaquée par le camp by_color (lecture de
+        la carte des attaques).
+        """
+        return sq >= 0 and (self.attacks[by_color] >> sq) & 1 == 1
+
+    def attackers_to(self, sq, by_color, occ=None):
+        """
+        Bitboard des pièces de by_color qui attaquent sq, obtenu en lançant
+        les rayons depuis la case elle-même. Une occupation hypothétique peut
+        être fournie pour tester un coup sans le jouer.
+        """
+        if occ is None:
+            occ = self.occupied[WHITE] | self.occupied[BLACK]
+        pieces = self.pieces[by_color]
+        queens = pieces[QUEEN]
+        return ((PAWN_ATTACKS[by_color ^ 1][sq] & pieces[PAWN])
+                | (KNIGHT_ATTACKS[sq] & pieces[KNIGHT])
+                | (KING_ATTACKS[sq] & pieces[KING])
+                | (bishop_attacks(sq, occ) & (pieces[BISHOP] | queens))
+                | (rook_attacks(sq, occ) & (pieces[ROOK] | queens)))
+
+    def king_attacked_after(self, move):
+        """
+        Indique si le roi du camp qui joue move serait attaqué après ce coup,
+        sans modifier la position: on rejoue seulement l'occupation.
+        """
+        frm, to = move & 63, (move >> 6) & 63
+        color, ptype = self.squares[frm]
+        to_bit = 1 << to
+        king = to if ptype == KING else self.king_square(color)
+        if king < 0:
+            return False
+        occ = ((self.occupied[WHITE] | self.occupied[BLACK]) & ~(1 << frm)) | to_bit
+        # Une pièce capturée (sur la case d'arrivée ou en passant) n'attaque plus
+        captured = to_bit
+        if ptype == PAWN:
+            ep_capture = self.en_passant_square(move)
+            if ep_capture >= 0:
+                captured |= 1 << ep_capture
+                occ &= ~(1 << ep_capture)
+        return self.attackers_to(king, color ^ 1, occ) & ~captured != 0
+
+    def generate_moves(self):
+        """
+        Génère les coups pseudo-légaux du camp au trait (sans vérifier l'échec).
+        """
+        moves = []
+        append = moves.append
+        us = self.side
+        own = self.occupied[us]
+        occ = own | self.occupied[us ^ 1]
+        pieces = self.pieces[us]
+        self._pawn_moves(us, pieces[PAWN], occ, moves)
+        self._castling_moves(us, occ, moves)
+        not_own = ~own
+        # Cavaliers et roi: simple lecture de table
+        for table, bb in ((KNIGHT_ATTACKS, pieces[KNIGHT]),
+                          (KING_ATTACKS, pieces[KING])):
+            while bb:
+                low = bb & -bb
+                frm = low.bit_length() - 1
+                bb ^= low
+                targets = table[frm] & not_own
+                while targets:
+                    t = targets & -targets
+                    append(frm | ((t.bit_length() - 1) << 6))
+                    targets ^= t
+        # Pièces glissantes: une lecture de table par ligne
+        diagonal = pieces[BISHOP] | pieces[QUEEN]
+        straight = pieces[ROOK] | pieces[QUEEN]
+        bb = diagonal | straight
+        while bb:
+            low = bb & -bb
+            frm = low.bit_length() - 1
+            bb ^= low
+            targets = 0
+            if diagonal & low:
+                targets = (DIAG_TABLES[frm][occ & DIAG_MASKS[frm]]
+                           | ANTI_TABLES[frm][occ & ANTI_MASKS[frm]])
+            if straight & low:
+                targets |= (RANK_TABLES[frm][occ & RANK_MASKS[frm]]
+                            | FILE_TABLES[frm][occ & FILE_MASKS[frm]])
+            targets &= not_own
+            while targets:
+                t = targets & -targets
+                append(frm | ((t.bit_length() - 1) << 6))
+                targets ^= t
+        return moves
+
+    def _pawn_moves(self, us, pawns, occ, moves):
+        # Poussées traitées en bloc par décalage du bitboard des pions. Une
+        # promotion donne quatre coups (dame, cavalier, tour, fou).
+        append = moves.append
+        empty = ~occ & BB_ALL
+        enemy = self.occupied[us ^ 1]
+        if self.ep >= 0 and us == self.side:
+            enemy |= 1 << self.ep
+        if us == WHITE:
+            single = (pawns << 8) & empty
+            double = ((single & RANK_3) << 8) & empty
+            step = 8
+            last_rank = RANK_8
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & RANK_6) >> 8) & empty
+            step = -8
+            last_rank = RANK_1
+        while single:
+            t = single & -single
+            to = t.bit_length() - 1
+            single ^= t
+            move = (to - step) | (to << 6)
+            if t & last_rank:
+                for promo in PROMOTION_FLAGS:
+                    append(move | promo)
+            else:
+                append(move)
+        while double:
+            t = double & -double
+            to = t.bit_length() - 1
+            double ^= t
+            append((to - 2 * step) | (to << 6))
+        attacks = PAWN_ATTACKS[us]
+        while pawns:
+            low = pawns & -pawns
+            frm = low.bit_length() - 1
+            pawns ^= low
+            captures = attacks[frm] & enemy
+            while captures:
+                t = captures & -captures
+                captures ^= t
+                move = frm | ((t.bit_length() - 1) << 6)
+                if t & last_rank:
+                    for promo in PROMOTION_FLAGS:
+                        append(move | promo)
+                else:
+                    append(move)
+
+    def _castling_moves(self, us, occ, moves):
+        # Roques permis: droit encore valable, cases entre le roi et la tour
+        # libres, roi ni en échec ni traversant une case attaquée
+        rights = self.castling
+        if not rights:
+            return
+        attacked = self.attacks[us ^ 1]
+        for right, king_from, king_to, _, _, empty, safe in CASTLES[us]:
+            if rights & right and not occ & empty and not attacked & (safe | (1 << king_from)):
+                moves.append(king_from | (king_to << 6))
+
+    def moves_from(self, sq):
+        """
+        Coups pseudo-légaux de la pièce posée sur sq, quel que soit le camp
+        au trait.
+        """
+        entry = self.squares[sq]
+        if entry is None:
+            return []
+        color, ptype = entry
+        own = self.occupied[color]
+        occ = own | self.occupied[color ^ 1]
+        moves = []
+        if ptype == PAWN:
+            self._pawn_moves(color, 1 << sq, occ, moves)
+            return moves
+        targets = piece_attacks(ptype, color, sq, occ) & ~own
+        while targets:
+            t = targets & -targets
+            moves.append(sq | ((t.bit_length() - 1) << 6))
+            targets ^= t
+        if ptype == KING:
+            self._castling_moves(color, occ, moves)
+        return moves
+
+    def pinned_pieces(self, us, king, occ):
+        """
+        Pièces de us clouées sur leur roi: dictionnaire case -> rayon sur
+        lequel la pièce peut encore bouger (cases entre le roi et le cloueur,
+        cloueur compris).
+        """
+        them = us ^ 1
+        enemy = self.pieces[them]
+        queens = enemy[QUEEN]
+        them_occ = self.occupied[them]
+        # Attaques depuis le roi à travers ses propres pièces
+        snipers = ((rook_attacks(king, them_occ) & (enemy[ROOK] | queens))
+                   | (bishop_attacks(king, them_occ) & (enemy[BISHOP] | queens)))
+        pins = {}
+        own = self.occupied[us]
+        between = BETWEEN[king]
+        while snipers:
+            low = snipers & -snipers
+            sniper = low.bit_length() - 1
+            snipers ^= low
+            blockers = between[sniper] & occ
+            # Exactement une pièce entre les deux, et c'est une des nôtres
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[blockers.bit_length() - 1] = between[sniper] | low
+        return pins
+
+    def generate_legal_moves(self, from_mask=BB_ALL, color=None):
+        """
+        Génère directement les coups légaux: les pièces clouées et les pièces
+        qui donnent échec sont calculées une seule fois, puis chaque coup est
+        restreint (parade de l'échec, rayon de clouage, cases non attaquées
+        pour le roi) sans avoir à le jouer.
+        """
+        us = self.side if color is None else color
+        king = self.kings[us]
+        if king < 0:
+            # Plus de roi (mode libre): tous les coups pseudo-légaux sont permis
+            saved_side = self.side
+            self.side = us
+            moves = [m for m in self.generate_moves() if (1 << (m & 63)) & from_mask]
+            self.side = saved_side
+            return moves
+        them = us ^ 1
+        own = self.occupied[us]
+        occ = own | self.occupied[them]
+        moves = []
+        append = moves.append
+        king_bit = 1 << king
+        checkers = self.attackers_to(king, them, occ)
+
+        # Coups du roi: cases non attaquées, en tenant compte des rayons qui
+        # traversent le roi (il ne peut pas reculer le long d'un échec)
+        if from_mask & king_bit:
+            targets = KING_ATTACKS[king] & ~own & ~self.attacks[them]
+            sliding = checkers & ~(self.pieces[them][PAWN] | self.pieces[them][KNIGHT])
+            while sliding:
+                low = sliding & -sliding
+                sq = low.bit_length() - 1
+                sliding ^= low
+                targets &= ~piece_attacks(self.squares[sq][1], them, sq, occ ^ king_bit)
+            while targets:
+                t = targets & -targets
+                append(king | ((t.bit_length() - 1) << 6))
+                targets ^= t
+            if not checkers:
+                self._castling_moves(us, occ, moves)
+        if checkers & (checkers - 1):
+            return moves  # Échec double: seul le roi peut bouger
+
+        # En échec simple: prendre la pièce qui donne échec ou s'interposer
+        if checkers:
+            target_mask = checkers | BETWEEN[king][checkers.bit_length() - 1]
+        else:
+            target_mask = ~own & BB_ALL
+        pins = self.pinned_pieces(us, king, occ)
+        pieces = self.pieces[us]
+        from_mask &= ~king_bit
+
+        candidates = []
+        self._pawn_moves(us, pieces[PAWN] & from_mask, occ, candidates)
+        ep = self.ep if us == self.side else -1
+        for move in candidates:
+            to = (move >> 6) & 63
+            to_bit = 1 << to
+            if to == ep:
+                # Prise en passant: deux pièces quittent la ligne du roi, on
+                # vérifie directement sur l'occupation obtenue
+                if not self.king_attacked_after(move):
+                    append(move)
+            elif to_bit & target_mask:
+                ray = pins.get(move & 63)
+                if ray is None or to_bit & ray:
+                    append(move)
+
+        bb = (pieces[KNIGHT] | pieces[BISHOP] | pieces[ROOK] | pieces[QUEEN]) & from_mask
+        squares = self.squares
+        while bb:
+            low = bb & -bb
+            frm = low.bit_length() - 1
+            bb ^= low
+            targets = piece_attacks(squares[frm][1], us, frm, occ) & target_mask
+            ray = pins.get(frm)
+            if ray is not None:
+                targets &= ray
+            while targets:
+                t = targets & -targets
+                append(frm | ((t.bit_length() - 1) << 6))
+                targets ^= t
+        return moves
+
+    def legal_moves_from(self, sq):
+        """
+        Coups légaux de la pièce posée sur sq (pour le camp de cette pièce).
+        """
+        entry = self.squares[sq]
+        if entry is None:
+            return []
+        return self.generate_legal_moves(1 << sq, entry[0])
+
+    def in_check(self, color=None):
+        color = self.side if color is None else color
+        return self.is_attacked(self.kings[color], color ^ 1)
+
+    def destinations(self, position):
+        """
+        Cases d'arrivée (row, col) de la pièce située en position (row, col),
+        au format utilisé par l'interface graphique.
+        """
+        return move_targets(self.moves_from(square_of(*position)))
+
+    def san(self, move, legal=None, suffix=True):
+        """
+        Notation algébrique standard (SAN) d'un coup légal: Nf3, exd5, e8=Q,
+        O-O, avec + ou # si suffix. legal: coups légaux de la position, s'ils
+        sont déjà générés.
+        """
+        frm, to, promotion = move & 63, (move >> 6) & 63, (move >> 12) & 7
+        ptype = self.squares[frm][1]
+        castle = self.castle_of(move)
+        if castle is not None:
+            text = "O-O" if castle[2] & 7 == 6 else "O-O-O"
+        else:
+            capture = self.squares[to] is not None or self.en_passant_square(move) >= 0
+            if ptype == PAWN:
+                text = ("abcdefgh"[frm & 7] + "x" if capture else "") + square_name(to)
+                if promotion:
+                    text += "=" + FEN_PIECES[promotion].upper()
+            else:
+                # Lever l'ambiguïté avec la colonne, sinon la rangée, sinon les deux
+                if legal is None:
+                    legal = self.generate_legal_moves()
+                others = [other & 63 for other in legal
+                          if (other >> 6) & 63 == to and other & 63 != frm
+                          and self.squares[other & 63][1] == ptype]
+                prefix = ""
+                if others:
+                    if all(sq & 7 != frm & 7 for sq in others):
+                        prefix = "abcdefgh"[frm & 7]
+                    elif all(sq >> 3 != frm >> 3 for sq in others):
+                        prefix = str((frm >> 3) + 1)
+                    else:
+                        prefix = square_name(frm)
+                text = FEN_PIECES[ptype].upper() + prefix + ("x" if capture else "") + square_name(to)
+        if suffix:
+            self.make_move(move)
+            if self.in_check():
+                text += "+" if self.generate_legal_moves() else "#"
+            self.unmake_move()
+        return text
+
+    def parse_san(self, text):
+        """
+        Coup légal correspondant à une notation SAN (les annotations +, #, !
+        et ? sont ignorées). Lève ValueError si aucun coup ne correspond.
+        """
+        wanted = text.rstrip("+#!?").replace("0", "O")
+        legal = self.generate_legal_moves()
+        for move in legal:
+            san = self.san(move, legal, False)
+            # La promotion est parfois écrite sans "=" (e8Q)
+            if san == wanted or san.replace("=", "") == wanted:
+                return move
+        raise ValueError(f"Coup invalide: {text}")
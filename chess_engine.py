@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_engine.py
+
+import time
+from array import array
+
+from chess_bitboard import (WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, KNIGHT_ATTACKS, KING_ATTACKS,
+                            PAWN_ATTACKS, rook_attacks, bishop_attacks)
+from chess_eval import evaluate
+from chess_tablebase import default_tablebases, WIN, LOSS
+
+# Types de borne stockés dans la table de transposition
+BOUND_EXACT = 0
+BOUND_LOWER = 1  # Score >= valeur stockée (coupure beta)
+BOUND_UPPER = 2  # Score <= valeur stockée (aucun coup n'a dépassé alpha)
+
+# Taille mémoire d'une entrée: clé (8 octets) + données compactées (8 octets)
+TT_ENTRY_BYTES = 16
+SCORE_OFFSET = 1 << 31
+
+
+def table_entries(size_mb):
+    # Nombre d'entrées: plus grande puissance de deux qui tient dans le budget
+    entries = max(2, int(size_mb * 1024 * 1024) // TT_ENTRY_BYTES)
+    return 1 << (entries.bit_length() - 1)
+
+
+class TranspositionTable:
+    """
+    Table de transposition de taille fixe, bornée par un budget mémoire en Mo.
+
+    Les entrées sont rangées par paires (seaux): la première case est
+    préférée en profondeur (remplacée seulement par une recherche au moins
+    aussi profonde ou par une entrée d'une recherche plus ancienne), la
+    seconde est remplacée à chaque écriture.
+    Chaque entrée tient dans deux entiers de 64 bits:
+        clé de Zobrist ^ données
+        score (32 bits) | coup (16 bits) | profondeur (8 bits)
+                        | borne (2 bits) | âge (6 bits)
+    La clé est stockée combinée aux données (xor): une entrée écrite à moitié
+    par un autre processus ne correspond à aucune clé et est ignorée, ce qui
+    permet de partager la table entre processus sans verrou (buffer: zone de
+    mémoire partagée de 2 * table_entries(size_mb) entiers de 64 bits).
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        self.buffer = buffer
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        self.size_mb = size_mb
+        self.size = table_entries(size_mb)
+        self.mask = (self.size - 1) & ~1  # Indice pair = début d'un seau
+        if self.buffer is not None:
+            # Table partagée: chaque processus s'y attache sans l'effacer
+            words = memoryview(self.buffer).cast("B").cast("Q")
+            self.keys = words[:self.size]
+            self.data = words[self.size:2 * self.size]
+        else:
+            self.keys = array("Q", bytes(8 * self.size))
+            self.data = array("Q", bytes(8 * self.size))
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def clear(self):
+        if self.buffer is not None:
+            self.keys[:] = array("Q", bytes(8 * self.size))
+            self.data[:] = array("Q", bytes(8 * self.size))
+        self.resize(self.size_mb)
+
+    def new_search(self):
+        # Vieillit les entrées existantes: elles deviennent remplaçables
+        self.age = (self.age + 1) & 63
+
+    def probe(self, key):
+        """
+        Cherche une position. Retourne (profondeur, borne, score, coup) ou None.
+        """
+        index = key & self.mask
+        keys = self.keys
+        data = self.data[index]
+        if keys[index] ^ data != key:
+            index += 1
+            data = self.data[index]
+            if keys[index] ^ data != key:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return ((data >> 48) & 0xFF, (data >> 56) & 3,
+                (data & 0xFFFFFFFF) - SCORE_OFFSET, (data >> 32) & 0xFFFF)
+
+    def store(self, key, depth, bound, score, move=0):
+        index = key & self.mask
+        keys = self.keys
+        data = self.data
+        old = data[index]
+        if keys[index + 1] ^ data[index + 1] == key:
+            index += 1
+            old = data[index]
+        elif keys[index] ^ old != key and old:
+            # Case préférée en profondeur occupée par une entrée plus profonde
+            # de la recherche courante: on écrit dans la case "toujours remplacée"
+            if (old >> 58) == self.age and (old >> 48) & 0xFF > depth:
+                index += 1
+                old = data[index]
+        if move == 0 and keys[index] ^ old == key:
+            # Garder le meilleur coup connu si la nouvelle entrée n'en a pas
+            move = (old >> 32) & 0xFFFF
+        value = ((score + SCORE_OFFSET)
+                 | (move << 32)
+                 | (min(depth, 255) << 48)
+                 | (bound << 56)
+                 | (self.age << 58))
+        data[index] = value
+        keys[index] = key ^ value
+        self.stores += 1
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def usage(self):
+        # Proportion des entrées occupées, sur 1000 entrées réparties sur
+        # toute la table (comme le hashfull UCI)
+        sample = min(self.size, 1000)
+        step = self.size // sample
+        return sum(1 for i in range(sample) if self.data[i * step]) / sample
+
+
+# Valeur des pièces en centièmes de pion, dans l'ordre de PIECE_NAMES
+# (valeur élevée pour le roi)
+PIECE_VALUES = (100, 300, 300, 500, 900, 10000)
+
+# Scores de mat: MATE_SCORE - ply pour un mat donné à ply demi-coups
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 64
+
+
+# Niveaux de l'IA: probabilité de jouer un coup au hasard, stratégie sinon
+# ("basic": meilleure capture, sinon au hasard; "search": recherche
+# alpha-bêta), temps de réflexion minimum / maximum en secondes, profondeur
+# maximale de recherche, recherche parallèle (plusieurs processus), et
+# bibliothèque d'ouvertures: nombre de demi-coups où elle est consultée avant
+# tout le reste, et exposant des poids (0: suites au hasard, grand: la plus
+# jouée, voir chess_book.OpeningBook.probe). Avec ponder, la recherche
+# continue pendant que le joueur réfléchit, sur la réponse qu'elle prévoit.
+AI_LEVELS = {
+    "facile": {"random": 0.8, "strategy": "basic", "think_time": (0.5, 1.5),
+               "depth": 0, "parallel": False, "book_depth": 4, "book_weighting": 0.0,
+               "ponder": False},
+    "moyen": {"random": 0.4, "strategy": "basic", "think_time": (1.0, 2.0),
+              "depth": 0, "parallel": False, "book_depth": 8, "book_weighting": 0.5,
+              "ponder": False},
+    "difficile": {"random": 0.1, "strategy": "search", "think_time": (1.5, 3.0),
+                  "depth": 4, "parallel": True, "book_depth": 12, "book_weighting": 1.0,
+                  "ponder": True},
+    "expert": {"random": 0.0, "strategy": "search", "think_time": (2.0, 4.0),
+               "depth": MAX_PLY - 1, "parallel": True,  # Limité seulement par le temps
+               "book_depth": 16, "book_weighting": 2.0, "ponder": True},
+}
+
+
+def see(position, move):
+    """
+    Échange statique (SEE) sur la case d'arrivée de move: gain matériel
+    (PIECE_VALUES) au bout de la suite de prises où chaque camp reprend avec
+    sa pièce la moins chère et peut s'arrêter quand ça l'arrange. Négatif:
+    la prise perd du matériel. Les clouages sont ignorés; les pièces à
+    longue portée cachées derrière un attaquant (rayons X) sont comptées.
+    """
+    frm, to = move & 63, (move >> 6) & 63
+    squares = position.squares
+    pieces = position.pieces
+    side, attacker = squares[frm]
+    occ = (position.occupied[WHITE] | position.occupied[BLACK]) ^ (1 << frm)
+    victim = squares[to]
+    gain = PIECE_VALUES[victim[1]] if victim is not None else 0
+    captured = position.en_passant_square(move)
+    if captured >= 0:
+        gain = PIECE_VALUES[PAWN]
+        occ ^= 1 << captured
+    # Valeur de la pièce posée sur la case (la pièce promue, le cas échéant)
+    on_square = PIECE_VALUES[attacker]
+    promotion = move >> 12
+    if promotion:
+        gain += PIECE_VALUES[promotion] - PIECE_VALUES[PAWN]
+        on_square = PIECE_VALUES[promotion]
+    diagonal = (pieces[WHITE][BISHOP] | pieces[WHITE][QUEEN] | pieces[BLACK][BISHOP] | pieces[BLACK][QUEEN])
+    straight = (pieces[WHITE][ROOK] | pieces[WHITE][QUEEN] | pieces[BLACK][ROOK] | pieces[BLACK][QUEEN])
+    attackers = ((PAWN_ATTACKS[BLACK][to] & pieces[WHITE][PAWN])
+                 | (PAWN_ATTACKS[WHITE][to] & pieces[BLACK][PAWN])
+                 | (KNIGHT_ATTACKS[to] & (pieces[WHITE][KNIGHT] | pieces[BLACK][KNIGHT]))
+                 | (KING_ATTACKS[to] & (pieces[WHITE][KING] | pieces[BLACK][KING]))
+                 | (bishop_attacks(to, occ) & diagonal)
+                 | (rook_attacks(to, occ) & straight)) & occ
+    gains = [gain]
+    color = side ^ 1
+    while True:
+        own = attackers & position.occupied[color]
+        if not own:
+            break
+        for ptype in range(KING + 1):
+            candidates = own & pieces[color][ptype]
+            if candidates:
+                break
+        # Le roi ne prend pas sur une case encore défendue
+        if ptype == KING and attackers & position.occupied[color ^ 1]:
+            break
+        gains.append(on_square - gains[-1])
+        on_square = PIECE_VALUES[ptype]
+        occ ^= candidates & -candidates
+        # Pièces découvertes derrière celle qui vient de prendre
+        if ptype in (PAWN, BISHOP, QUEEN):
+            attackers |= bishop_attacks(to, occ) & diagonal
+        if ptype in (ROOK, QUEEN):
+            attackers |= rook_attacks(to, occ) & straight
+        attackers &= occ
+        color ^= 1
+    # Chaque camp choisit entre continuer l'échange et s'arrêter
+    while len(gains) > 1:
+        last = gains.pop()
+        gains[-1] = min(gains[-1], -last)
+    return gains[0]
+
+
+def best_capture(position, moves):
+    """
+    Stratégie de base: parmi moves, la prise qui gagne le plus de matériel
+    d'après l'échange statique (see), la plus grosse victime en cas
+    d'égalité, ou 0 s'il n'y a pas de prise qui ne perde pas de matériel.
+    """
+    best_move = 0
+    best_key = None
+    squares = position.squares
+    for move in moves:
+        victim = squares[(move >> 6) & 63]
+        if victim is None:
+            continue
+        gain = see(position, move)
+        if gain >= 0 and (best_key is None or (gain, PIECE_VALUES[victim[1]]) > best_key):
+            best_move = move
+            best_key = (gain, PIECE_VALUES[victim[1]])
+    return best_move
+
+
+# Ordre des coups: coup de la table de transposition, prises (MVV-LVA:
+# victime la plus forte puis attaquant le plus faible) et promotions, coups
+# "killer" du demi-coup, puis coups calmes selon l'historique
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+HISTORY_LIMIT = 1 << 20  # Au-delà, l'historique est divisé par deux
+
+# Recherche de quiescence: une prise n'est pas essayée si même le gain de la
+# pièce prise plus cette marge ne suffit pas à dépasser alpha
+DELTA_MARGIN = 200
+
+
+class MoveOrdering:
+    """
+    Heuristiques d'ordre des coups, gardées d'une recherche à l'autre comme
+    la table de transposition: deux coups killer par demi-coup (coups calmes
+    qui ont provoqué une coupure bêta à ce demi-coup) et une table
+    d'historique par camp, indexée par (départ, arrivée), qui cumule
+    profondeur² pour chaque coupure d'un coup calme et se divise par deux à
+    chaque nouvelle recherche.
+
+    cutoffs compte les coupures bêta, first_move_cutoffs celles du premier
+    coup essayé: leur rapport mesure la qualité de l'ordre.
+    """
+
+    def __init__(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def clear(self):
+        # Nouvelle partie: rien à garder
+        self.__init__()
+
+    def new_search(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        for table in self.history:
+            table[:] = [value >> 1 for value in table]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def order(self, position, moves, hash_move, ply):
+        """
+        Trie moves sur place, du plus prometteur au moins prometteur.
+        """
+        squares = position.squares
+        ep = position.ep
+        killer1, killer2 = self.killers[ply]
+        history = self.history[position.side]
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            frm, to = move & 63, (move >> 6) & 63
+            victim = squares[to]
+            promotion = move >> 12
+            if victim is not None or promotion:
+                # Une promotion compte comme le gain de la pièce promue
+                gained = (victim[1] if victim is not None else 0) + promotion
+                return CAPTURE_SCORE + gained * 8 - squares[frm][1]
+            if to == ep and squares[frm][1] == PAWN:
+                return CAPTURE_SCORE  # Prise en passant: pion par pion
+            if move == killer1:
+                return KILLER_SCORE
+            if move == killer2:
+                return KILLER_SCORE - 1
+            return history[move & 4095]
+
+        moves.sort(key=score, reverse=True)
+
+    def cutoff(self, position, move, depth, ply, first):
+        """
+        Coupure bêta de move (position avant le coup): met à jour les
+        compteurs, et pour un coup calme les killers et l'historique.
+        """
+        self.cutoffs += 1
+        if first:
+            self.first_move_cutoffs += 1
+        to = (move >> 6) & 63
+        if (position.squares[to] is not None or move >> 12
+                or (to == position.ep and position.squares[move & 63][1] == PAWN)):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        table = self.history[position.side]
+        table[move & 4095] += depth * depth
+        if table[move & 4095] > HISTORY_LIMIT:
+            for table in self.history:
+                table[:] = [value >> 1 for value in table]
+
+
+def score_to_tt(score, ply):
+    # Les scores de mat sont stockés relativement au nœud, pas à la racine
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def tablebase_score(result, dtm, ply):
+    # Score d'une position des tables de finales (distance au mat en coups)
+    if result == WIN:
+        return MATE_SCORE - ply - (2 * dtm - 1)
+    if result == LOSS:
+        return -MATE_SCORE + ply + 2 * dtm
+    return 0
+
+
+class SearchStopped(Exception):
+    pass
+
+
+class Search:
+    """
+    Recherche négamax alpha-bêta avec approfondissement itératif.
+
+    La position est modifiée par make_move / unmake_move pendant la recherche
+    et retrouve son état d'origine à la fin. Seuls les résultats d'une
+    profondeur entièrement terminée sont retenus: on peut donc arrêter la
+    recherche à tout moment (stop_check) et garder le dernier coup complet.
+    Les positions des tables de finales (chess_tablebase) ont un score exact.
+    ordering (MoveOrdering) peut être gardé d'une recherche à l'autre, comme tt.
+    """
+
+    def __init__(self, position, tt=None, evaluate=evaluate, tablebases=None, ordering=None):
+        self.position = position
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.ordering = ordering if ordering is not None else MoveOrdering()
+        self.evaluate = evaluate
+        self.tablebases = tablebases if tablebases is not None else default_tablebases()
+        self.nodes = 0
+        self.stop_check = None
+        self.stopped = False
+        # Variante principale (table triangulaire)
+        self.pv_table = [[0] * MAX_PLY for _ in range(MAX_PLY)]
+        self.pv_length = [0] * MAX_PLY
+        self.pv = []
+        self.best_move = 0
+        self.best_score = 0
+        self.depth = 0
+        self.elapsed = 0.0
+
+    def iterate(self, max_depth, stop_check=None, start_depth=1):
+        """
+        Approfondissement itératif: génère (profondeur, score, pv) après
+        chaque profondeur terminée (à partir de start_depth).
+        """
+        self.stop_check = stop_check
+        self.stopped = False
+        self.nodes = 0
+        self.tt.new_search()
+        self.ordering.new_search()
+        history_size = len(self.position.history)
+        for depth in range(start_depth, max_depth + 1):
+            try:
+                score = self.negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                # Profondeur interrompue: on revient à la position d'origine
+                while len(self.position.history) > history_size:
+                    self.position.unmake_move()
+                self.stopped = True
+                return
+            self.depth = depth
+            self.best_score = score
+            self.pv = self.pv_table[0][:self.pv_length[0]]
+            if self.pv:
+                self.best_move = self.pv[0]
+            yield depth, score, self.pv
+            # Mat trouvé: inutile d'aller plus loin
+            if abs(score) >= MATE_BOUND:
+                return
+
+    def search(self, max_depth, stop_check=None, start_depth=1):
+        """
+        Cherche jusqu'à max_depth (ou jusqu'à l'arrêt) et retourne le meilleur
+        coup de la dernière profondeur terminée (0 s'il n'y en a aucun).
+        """
+        self.best_move = 0
+        for _ in self.iterate(max_depth, stop_check, start_depth):
+            pass
+        return self.best_move
+
+    def think(self, soft_time, hard_time, max_depth=MAX_PLY - 1):
+        """
+        Recherche gérée par le temps: pas de nouvelle itération après
+        soft_time secondes, arrêt immédiat à hard_time. On s'arrête plus tôt
+        si le coup est forcé ou si le meilleur coup reste stable.
+        """
+        start = time.perf_counter()
+        soft_deadline = start + soft_time
+        hard_deadline = start + hard_time
+        self.best_move = 0
+        self.depth = 0
+        # Finale dans les tables: coup parfait, sans recherche
+        found = self.tablebases.best_move(self.position)
+        if found is not None:
+            self.best_move, result, dtm = found
+            self.best_score = tablebase_score(result, dtm, 0)
+            self.pv = [self.best_move]
+            self.elapsed = time.perf_counter() - start
+            return self.best_move
+        moves = self.position.generate_legal_moves()
+        if len(moves) <= 1:
+            # Coup forcé (ou aucun coup): inutile de chercher
+            self.best_move = moves[0] if moves else 0
+            self.elapsed = time.perf_counter() - start
+            return self.best_move
+        stable = 0
+        previous_move = 0
+        previous_duration = 0.0
+        iteration_start = start
+        for depth, score, pv in self.iterate(max_depth,
+                                             lambda: time.perf_counter() >= hard_deadline):
+            now = time.perf_counter()
+            duration = now - iteration_start
+            iteration_start = now
+            stable = stable + 1 if self.best_move == previous_move else 0
+            previous_move = self.best_move
+            if now >= soft_deadline:
+                break
+            # Meilleur coup inchangé depuis plusieurs profondeurs: on joue
+            if stable >= 3 and now - start >= soft_time / 2:
+                break
+            # L'itération suivante coûte plusieurs fois la précédente:
+            # ne pas la commencer si elle ne peut pas finir avant la limite
+            if previous_duration > 0 and now + duration * duration / previous_duration > hard_deadline:
+                break
+            previous_duration = duration
+        self.elapsed = time.perf_counter() - start
+        return self.best_move
+
+    def nps(self):
+        # Nœuds par seconde de la dernière recherche think()
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    def negamax(self, depth, alpha, beta, ply):
+        position = self.position
+        self.nodes += 1
+        if self.stop_check is not None and self.nodes & 255 == 0 and self.stop_check():
+            raise SearchStopped()
+        self.pv_length[ply] = ply
+
+        # Table de transposition: coupure directe si l'entrée est assez profonde
+        key = position.key
+        hash_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_depth, bound, tt_score, hash_move = entry
+            if tt_depth >= depth and ply > 0:
+                tt_score = score_from_tt(tt_score, ply)
+                if (bound == BOUND_EXACT
+                        or (bound == BOUND_LOWER and tt_score >= beta)
+                        or (bound == BOUND_UPPER and tt_score <= alpha)):
+                    return tt_score
+
+        # Finale dans les tables: score exact (pas à la racine, où il faut un coup)
+        if ply > 0 and self.tablebases.max_men:
+            found = self.tablebases.probe(position)
+            if found is not None:
+                return tablebase_score(found[0], found[1], ply)
+
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self.quiescence(alpha, beta, ply)
+
+        moves = position.generate_legal_moves()
+        if not moves:
+            # Mat ou pat
+            if position.in_check():
+                return -MATE_SCORE + ply
+            return 0
+        self.ordering.order(position, moves, hash_move, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = moves[0]
+        pv_table = self.pv_table
+        for index, move in enumerate(moves):
+            position.make_move(move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    # Mise à jour de la variante principale
+                    row = pv_table[ply]
+                    row[ply] = move
+                    child_length = self.pv_length[ply + 1]
+                    row[ply + 1:child_length] = pv_table[ply + 1][ply + 1:child_length]
+                    self.pv_length[ply] = max(child_length, ply + 1)
+                    if alpha >= beta:
+                        self.ordering.cutoff(position, move, depth, ply, index == 0)
+                        break
+
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score > original_alpha:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+        self.tt.store(key, depth, bound, score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def quiescence(self, alpha, beta, ply):
+        """
+        Recherche des prises seulement, aux feuilles, jusqu'à une position
+        calme: le camp au trait peut s'en tenir à l'évaluation statique
+        (stand pat) ou prendre. Les prises qui ne peuvent pas remonter alpha
+        (delta) ou qui perdent du matériel à l'échange (see) ne sont pas
+        cherchées. En échec, toutes les parades sont essayées.
+        """
+        position = self.position
+        self.nodes += 1
+        if self.stop_check is not None and self.nodes & 255 == 0 and self.stop_check():
+            raise SearchStopped()
+        self.pv_length[ply] = ply
+        if ply >= MAX_PLY - 1:
+            return self.evaluate(position)
+
+        moves = position.generate_legal_moves()
+        in_check = position.in_check()
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+        squares = position.squares
+        if in_check:
+            best_score = -INFINITY
+        else:
+            best_score = self.evaluate(position)
+            if best_score >= beta:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+            ep = position.ep
+            moves = [move for move in moves
+                     if squares[(move >> 6) & 63] is not None or move >> 12 == QUEEN
+                     or ((move >> 6) & 63 == ep and squares[move & 63][1] == PAWN)]
+        self.ordering.order(position, moves, 0, ply)
+
+        stand_pat = best_score
+        for move in moves:
+            if not in_check:
+                victim = squares[(move >> 6) & 63]
+                gained = PIECE_VALUES[victim[1] if victim is not None else PAWN]
+                if move >> 12:
+                    gained += PIECE_VALUES[QUEEN] - PIECE_VALUES[PAWN]
+                if stand_pat + gained + DELTA_MARGIN <= alpha or see(position, move) < 0:
+                    continue
+            position.make_move(move)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
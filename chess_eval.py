@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_eval.py
+
+# Évaluation par tables pièce-case effilées (milieu de partie / finale).
+# Les termes sont tenus à jour de façon incrémentale par la position
+# bitboard (put_piece / remove_piece), l'évaluation d'une feuille se
+# résume donc à quelques lectures d'entiers.
+# Les tables sont écrites du point de vue des blancs, 8e rangée en haut,
+# dans l'ordre des types de PIECE_NAMES (pion, cavalier, fou, tour, dame, roi).
+
+# Valeur matérielle en milieu de partie et en finale (centièmes de pion)
+MATERIAL_MG = (82, 337, 365, 477, 1025, 0)
+MATERIAL_EG = (94, 281, 297, 512, 936, 0)
+
+# Poids de chaque pièce dans la phase de jeu (24 = toutes les pièces)
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+PHASE_TOTAL = 24
+
+PAWN_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+PAWN_EG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+    100, 100, 100, 100, 100, 100, 100, 100,
+     60,  60,  60,  60,  60,  60,  60,  60,
+     35,  35,  35,  35,  35,  35,  35,  35,
+     20,  20,  20,  20,  20,  20,  20,  20,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+KNIGHT_MG = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+KNIGHT_EG = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+BISHOP_MG = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+BISHOP_EG = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,   0,  10,  15,  15,  10,   0, -10,
+    -10,   0,  10,  15,  15,  10,   0, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+ROOK_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+ROOK_EG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+QUEEN_MG = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+QUEEN_EG = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+     -5,   0,  10,  15,  15,  10,   0,  -5,
+     -5,   0,  10,  15,  15,  10,   0,  -5,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+KING_MG = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+KING_EG = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+
+def _psq_tables(material, tables):
+    # Combine matériel et table pièce-case, indexé [couleur][type][case] avec
+    # les cases a1 = 0 ... h8 = 63. Les valeurs noires sont négatives et
+    # lues en miroir vertical, de sorte qu'une simple somme donne le score
+    # du point de vue des blancs.
+    white = []
+    black = []
+    for ptype, table in enumerate(tables):
+        # Indice dans la table écrite 8e rangée en haut: sq ^ 56
+        white.append([material[ptype] + table[sq ^ 56] for sq in range(64)])
+        black.append([-(material[ptype] + table[sq]) for sq in range(64)])
+    return (white, black)
+
+
+PSQ_MG = _psq_tables(MATERIAL_MG, (PAWN_MG, KNIGHT_MG, BISHOP_MG, ROOK_MG, QUEEN_MG, KING_MG))
+PSQ_EG = _psq_tables(MATERIAL_EG, (PAWN_EG, KNIGHT_EG, BISHOP_EG, ROOK_EG, QUEEN_EG, KING_EG))
+
+
+def evaluate(position):
+    """
+    Évaluation statique du point de vue du camp au trait (négamax):
+    interpolation entre les scores de milieu de partie et de finale selon
+    la phase de jeu, tous tenus à jour par la position.
+    """
+    phase = min(position.phase, PHASE_TOTAL)
+    score = (position.mg * phase + position.eg * (PHASE_TOTAL - phase)) // PHASE_TOTAL
+    return score if position.side == 0 else -score
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_game.py
+
+# État d'une partie (plateau de pièces, position bitboard, historique) sans
+# pygame: utilisable sans écran par les processus de calcul, les benchmarks
+# et les parties IA contre IA. chess_1v1 et chess_player_vs_ai y ajoutent
+# l'affichage.
+
+from chess_bitboard import (Position, WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, COLOR_NAMES,
+                            CASTLES, START_FEN, square_of, row_col, encode_move, move_promotion,
+                            move_targets)
+
+class ChessPiece:
+    # Pièce du plateau affiché; ses coups sont générés par la position
+    # bitboard (chess_bitboard), seule source des règles du jeu
+    def __init__(self, piece_type, color, position):
+        self.piece_type = piece_type
+        self.color = color
+        self.position = position
+        self.has_moved = False
+
+class Pawn(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("pawn", color, position)
+
+class Rook(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("rook", color, position)
+
+class Knight(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("knight", color, position)
+
+class Bishop(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("bishop", color, position)
+
+class Queen(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("queen", color, position)
+
+class King(ChessPiece):
+    def __init__(self, color, position):
+        super().__init__("king", color, position)
+
+# Classes des pièces dans l'ordre des types de chess_bitboard (PIECE_NAMES)
+PIECE_CLASSES = (Pawn, Knight, Bishop, Rook, Queen, King)
+# Nom affiché de la pièce choisie lors d'une promotion
+PROMOTION_NAMES = {QUEEN: "Dame", ROOK: "Tour", BISHOP: "Fou", KNIGHT: "Cavalier"}
+
+class GameState:
+    """
+    Règles d'une partie: plateau de pièces (8x8, None = case vide) tenu
+    synchronisé avec la position bitboard, qui génère les coups. Aucun
+    affichage: les jeux pygame héritent de cette classe.
+    """
+    
+    def __init__(self, fen=START_FEN):
+        self.load_fen(fen)
+    
+    def load_fen(self, fen):
+        """
+        Place les pièces d'une position FEN (position initiale par défaut) et
+        repart d'un historique vide. Lève ValueError si la FEN est invalide.
+        """
+        # Position bitboard utilisée comme source des coups
+        position = Position.from_fen(fen)
+        # Plateau de pièces (None = case vide) construit d'après la position
+        board = [[None for _ in range(8)] for _ in range(8)]
+        rights = [castle for castles in CASTLES for castle in castles if position.castling & castle[0]]
+        for sq, entry in enumerate(position.squares):
+            if entry is None:
+                continue
+            color, ptype = entry
+            row, col = row_col(sq)
+            piece = PIECE_CLASSES[ptype](COLOR_NAMES[color], (row, col))
+            # Pions hors de leur rangée de départ, roi et tours qui ont perdu
+            # leurs droits de roque: considérés comme ayant déjà bougé
+            if ptype == PAWN:
+                piece.has_moved = row != (6 if color == WHITE else 1)
+            elif ptype == KING:
+                piece.has_moved = not any(castle[1] == sq for castle in rights)
+            elif ptype == ROOK:
+                piece.has_moved = not any(castle[3] == sq for castle in rights)
+            board[row][col] = piece
+        self.board = board
+        self.position = position
+        # Pile des coups joués, pour pouvoir les annuler
+        self.move_history = []
+        self.current_player = COLOR_NAMES[position.side]
+        self.check_status = {"white": False, "black": False}
+        self.check_for_check()
+        self.game_over = self.is_checkmate()
+        self.winner = COLOR_NAMES[position.side ^ 1] if self.game_over else None
+    
+    def fen(self):
+        # Chaîne FEN de la partie en cours (voir Position.fen)
+        return self.position.fen()
+    
+    def get_all_possible_moves(self, piece):
+        """
+        Retourne tous les mouvements possibles sans restrictions de règles,
+        juste en respectant les limites du plateau et la non-capture des pièces amies.
+        """
+        # Les coups sont générés par la position bitboard (pseudo-légaux)
+        return self.position.destinations(piece.position)
+    
+    def move_piece(self, piece, new_position, promotion=QUEEN):
+        """
+        Joue un coup sur le plateau et la position bitboard. Retourne le type
+        de la pièce promue (0 sans promotion).
+        """
+        old_row, old_col = piece.position
+        new_row, new_col = new_position
+        
+        # Répercuter le coup sur la position bitboard, qui reconnaît le roque
+        # et la prise en passant
+        bb_move = self.to_bitboard_move(piece, new_position, promotion)
+        castle = self.position.castle_of(bb_move)
+        ep_square = self.position.en_passant_square(bb_move)
+        self.position.make_move(bb_move)
+        
+        # Pièce prise: sur la case d'arrivée, ou à côté en cas de prise en passant
+        captured_position = row_col(ep_square) if ep_square >= 0 else new_position
+        captured = self.board[captured_position[0]][captured_position[1]]
+        self.board[captured_position[0]][captured_position[1]] = None
+        
+        # Roque: la tour passe de l'autre côté du roi
+        rook_move = None
+        if castle is not None:
+            rook_row, rook_col = row_col(castle[3])
+            rook = self.board[rook_row][rook_col]
+            rook_move = (rook, rook.position, rook.has_moved)
+            self.board[rook_row][rook_col] = None
+            rook.position = row_col(castle[4])
+            self.board[rook.position[0]][rook.position[1]] = rook
+            rook.has_moved = True
+        
+        # Garder de quoi annuler le coup (pièce prise, ancien drapeau has_moved,
+        # tour déplacée par le roque)
+        self.move_history.append((piece, piece.position, captured, captured_position,
+                                  piece.has_moved, rook_move))
+        
+        # Mettre à jour la position de la pièce
+        self.board[old_row][old_col] = None
+        self.board[new_row][new_col] = piece
+        piece.position = new_position
+        piece.has_moved = True
+        
+        # Gérer la promotion du pion: remplacer le pion par la pièce choisie
+        promoted = move_promotion(bb_move)
+        if promoted:
+            self.board[new_row][new_col] = PIECE_CLASSES[promoted](piece.color, (new_row, new_col))
+        
+        # Changer de joueur
+        self.current_player = "black" if self.current_player == "white" else "white"
+        return promoted
+    
+    def to_bitboard_move(self, piece, new_position, promotion=QUEEN):
+        # Encodage du coup pour la position bitboard (promotion en dame par défaut)
+        new_row, new_col = new_position
+        if piece.piece_type != "pawn" or new_row != (0 if piece.color == "white" else 7):
+            promotion = 0
+        return encode_move(square_of(*piece.position), square_of(new_row, new_col), promotion)
+    
+    def undo_move(self):
+        # Annuler le dernier coup joué: on dépile la position et le plateau
+        if not self.move_history:
+            return False
+        piece, old_position, captured, captured_position, had_moved, rook_move = self.move_history.pop()
+        self.position.unmake_move()
+        new_row, new_col = piece.position
+        old_row, old_col = old_position
+        # Le pion promu reprend sa place (la pièce créée est simplement oubliée)
+        self.board[new_row][new_col] = None
+        self.board[captured_position[0]][captured_position[1]] = captured
+        self.board[old_row][old_col] = piece
+        piece.position = old_position
+        piece.has_moved = had_moved
+        if rook_move is not None:
+            # Annuler aussi le déplacement de la tour du roque
+            rook, rook_position, rook_had_moved = rook_move
+            self.board[rook.position[0]][rook.position[1]] = None
+            self.board[rook_position[0]][rook_position[1]] = rook
+            rook.position = rook_position
+            rook.has_moved = rook_had_moved
+        
+        self.current_player = piece.color
+        self.game_over = False
+        self.winner = None
+        self.check_for_check()
+        return True
+    
+    def get_legal_moves(self, piece):
+        # Coups légaux générés directement par la position bitboard
+        # (clouages et échecs calculés une seule fois, aucun coup d'essai)
+        return move_targets(self.position.legal_moves_from(square_of(*piece.position)))
+    
+    def find_king(self, color):
+        # Position du roi suivie par la position bitboard (plus de parcours du plateau)
+        sq = self.position.king_square(COLOR_NAMES.index(color))
+        if sq < 0:
+            return None  # Ne devrait jamais arriver dans une partie normale
+        return row_col(sq)
+    
+    def is_position_attacked(self, position, by_color):
+        # Vérifier si une position est attaquée par une pièce de la couleur donnée
+        # (lecture de la carte des attaques tenue à jour par la position bitboard)
+        if position is None:
+            return False
+        return self.position.is_attacked(square_of(*position), COLOR_NAMES.index(by_color))
+    
+    def check_for_check(self):
+        # Vérifier si l'un des rois est en échec
+        white_king_pos = self.find_king("white")
+        black_king_pos = self.find_king("black")
+        
+        self.check_status["white"] = self.is_position_attacked(white_king_pos, "black")
+        self.check_status["black"] = self.is_position_attacked(black_king_pos, "white")
+    
+    def is_checkmate(self):
+        # Vérifier s'il y a échec et mat
+        color = self.current_player
+        
+        # Si le roi n'est pas en échec, ce n'est pas un échec et mat
+        if not self.check_status[color]:
+            return False
+        
+        # Vérifier si une pièce peut faire un mouvement légal
+        if self.position.generate_legal_moves(color=COLOR_NAMES.index(color)):
+            return False  # Il y a au moins un mouvement légal, pas d'échec et mat
+        
+        # Aucun mouvement légal n'est possible et le roi est en échec, c'est un échec et mat
+        return True
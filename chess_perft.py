@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_perft.py
+
+import argparse
+import struct
+import sys
+import time
+
+from chess_bitboard import Position, START_FEN, PACKED_FORMAT, WHITE, move_to_uci
+from chess_book import book_key
+
+# Clés Polyglot de référence (spécification du format Polyglot)
+BOOK_KEY_SUITE = (
+    (START_FEN, 0x463B96181691FC9C),
+    ("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1", 0x823C9B50FD114196),
+    ("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 2", 0x0756B94461C50FB0),
+    ("rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 2", 0x662FAFB965DB29D4),
+    ("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3", 0x22A48B5A8E47FF78),
+    ("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPPKPPP/RNBQ1BNR b kq - 0 3", 0x652A607CA3F242C1),
+    ("rnbq1bnr/ppp1pkpp/8/3pPp2/8/8/PPPPKPPP/RNBQ1BNR w - - 0 4", 0x00FDD303C946BDD9),
+    ("rnbqkbnr/p1pppppp/8/8/PpP4P/8/1P1PPPP1/RNBQKBNR b KQkq c3 0 3", 0x3C8123EA7B067637),
+    ("rnbqkbnr/p1pppppp/8/8/P6P/R1p5/1P1PPPP1/1NBQKBNR b Kkq - 0 4", 0x5C3F9B829B279560),
+)
+
+# Positions de référence (chessprogramming.org, "Perft Results") et nombre
+# de feuilles attendu pour les profondeurs 1, 2, 3...
+PERFT_SUITE = (
+    ("Position initiale", START_FEN,
+     (20, 400, 8902, 197281, 4865609)),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     (48, 2039, 97862, 4085603)),
+    ("Position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     (14, 191, 2812, 43238, 674624)),
+    ("Position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     (6, 264, 9467, 422333)),
+    ("Position 4 (miroir)", "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     (6, 264, 9467, 422333)),
+    ("Position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     (44, 1486, 62379, 2103487)),
+    ("Position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     (46, 2079, 89890, 3894594)),
+)
+
+
+def perft(position, depth):
+    """
+    Nombre de feuilles de l'arbre des coups légaux à la profondeur donnée.
+    """
+    if depth == 0:
+        return 1
+    moves = position.generate_legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+
+def divide(position, depth):
+    """
+    Perft détaillé par coup racine: liste de (coup UCI, feuilles).
+    """
+    results = []
+    for move in position.generate_legal_moves():
+        position.make_move(move)
+        results.append((move_to_uci(move), perft(position, depth - 1) if depth > 1 else 1))
+        position.unmake_move()
+    return sorted(results)
+
+
+def run_perft(fen, depth, expected=None, show_divide=False, name=None):
+    """
+    Lance un perft, affiche le résultat et retourne True si le compte
+    correspond à la référence (ou s'il n'y en a pas).
+    """
+    position = Position.from_fen(fen)
+    start = time.perf_counter()
+    if show_divide:
+        results = divide(position, depth)
+        for uci, count in results:
+            print(f"    {uci}: {count}")
+        nodes = sum(count for _, count in results)
+    else:
+        nodes = perft(position, depth)
+    elapsed = time.perf_counter() - start
+    nps = int(nodes / elapsed) if elapsed > 0 else 0
+    status = ""
+    if expected is not None:
+        status = "OK" if nodes == expected else f"ÉCHEC (attendu {expected})"
+    print(f"{name or fen} | prof. {depth} | {nodes} feuilles | "
+          f"{elapsed:.2f} s | {nps} nœuds/s {status}")
+    return expected is None or nodes == expected
+
+
+def check_encoding():
+    """
+    Vérifie l'encodage des positions: aller-retour FEN et Position.pack /
+    unpack sur les positions de la suite et celles atteintes en deux
+    demi-coups, rejet des données binaires invalides et clés Polyglot de la
+    bibliothèque d'ouvertures. Retourne True si tout est correct.
+    """
+    errors = []
+    count = 0
+    for name, fen, _ in PERFT_SUITE:
+        position = Position.from_fen(fen)
+        for move in position.generate_legal_moves():
+            position.make_move(move)
+            for reply in position.generate_legal_moves():
+                position.make_move(reply)
+                count += 1
+                text = position.fen()
+                if Position.from_fen(text).fen() != text or Position.unpack(position.pack()).fen() != text:
+                    errors.append(f"{name}: aller-retour incorrect pour {text}")
+                position.unmake_move()
+            position.unmake_move()
+    # Données binaires invalides: plus de 32 pièces, prise en passant hors de l'échiquier
+    valid = Position.from_fen(START_FEN).pack()
+    occupied, nibbles, flags, ep, halfmove, fullmove = struct.unpack(PACKED_FORMAT, valid)
+    for label, data in (("33 pièces", struct.pack(PACKED_FORMAT, occupied | 1 << 40, nibbles, flags,
+                                                      ep, halfmove, fullmove)),
+                        ("prise en passant 64", struct.pack(PACKED_FORMAT, occupied, nibbles, flags,
+                                                             64, halfmove, fullmove)),
+                        ("prise en passant -2", struct.pack(PACKED_FORMAT, occupied, nibbles, flags,
+                                                             -2, halfmove, fullmove))):
+        try:
+            Position.unpack(data)
+            errors.append(f"Position binaire acceptée: {label}")
+        except ValueError:
+            pass
+    # Case de prise en passant impossible dans une FEN: ignorée, comme fen() le fait
+    for fen in ("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e3 0 1",
+                "rnbqkbnr/pppp1ppp/8/4p3/3P4/8/PPP1PPPP/RNBQKBNR b KQkq e6 0 2",
+                "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq d3 0 3"):
+        if Position.from_fen(fen).ep >= 0:
+            errors.append(f"Prise en passant impossible acceptée: {fen}")
+    # Clés de la bibliothèque d'ouvertures: celles de Polyglot
+    for fen, key in BOOK_KEY_SUITE:
+        if book_key(Position.from_fen(fen)) != key:
+            errors.append(f"Clé Polyglot incorrecte: {fen}")
+    for error in errors:
+        print(error)
+    print(f"Encodage: {count} positions, {'OK' if not errors else 'ÉCHEC'}")
+    return not errors
+
+
+def position_errors(position):
+    # Incohérences entre les représentations de la position (cases, bitboards,
+    # listes de pièces, clé incrémentale)
+    errors = []
+    for color in (0, 1):
+        pieces = position.piece_lists[color]
+        squares = [sq for sq, entry in enumerate(position.squares) if entry is not None and entry[0] == color]
+        if sorted(pieces) != squares:
+            errors.append("listes de pièces")
+        bits = 0
+        for ptype, bb in enumerate(position.pieces[color]):
+            if any(position.squares[sq] != (color, ptype) for sq in range(64) if bb >> sq & 1):
+                errors.append("bitboards")
+            bits |= bb
+        if bits != position.occupied[color]:
+            errors.append("occupation")
+    if position.compute_key() != position.key:
+        errors.append("clé")
+    return errors
+
+
+def check_free_moves():
+    """
+    Vérifie les coups "libres" du roi de deux colonnes (mode libre de
+    l'interface): sans cases libres jusqu'à la tour, ce n'est pas un roque
+    et la tour reste en place. Retourne True si tout est correct.
+    """
+    errors = []
+    # (position, coup du roi, rangée du roi attendue après le coup)
+    cases = (
+        ("rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R w KQkq - 0 1", (4, 6), "RNBQ1BKR"),
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RN2KBNR w KQkq - 0 1", (4, 2), "RNK2BNR"),
+        ("rn2kbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1", (60, 58), "rnk2bnr"),
+        # Vrai roque: la tour passe de l'autre côté du roi
+        ("r3kbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1", (60, 58), "2kr1bnr"),
+    )
+    for fen, (frm, to), rank in cases:
+        position = Position.from_fen(fen)
+        position.make_move(frm | (to << 6))
+        text = position.fen()
+        row = text.split("/")[0 if position.side == WHITE else 7].split()[0]
+        if row != rank:
+            errors.append(f"{fen}: rangée {row} au lieu de {rank}")
+        errors += [f"{fen}: incohérence ({error}) après le coup" for error in position_errors(position)]
+        position.unmake_move()
+        if position.fen() != fen or position_errors(position):
+            errors.append(f"{fen}: position mal restaurée")
+    for error in errors:
+        print(error)
+    print(f"Coups libres: {len(cases)} positions, {'OK' if not errors else 'ÉCHEC'}")
+    return not errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Perft: vérifie et chronomètre le générateur de coups.")
+    parser.add_argument("--depth", type=int, default=3,
+                        help="profondeur maximale (3 par défaut)")
+    parser.add_argument("--fen", help="position à tester au lieu de la suite de référence")
+    parser.add_argument("--divide", action="store_true",
+                        help="affiche le nombre de feuilles par coup racine")
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        ok = run_perft(args.fen, args.depth, show_divide=args.divide)
+        return 0 if ok else 1
+
+    ok = check_encoding()
+    ok &= check_free_moves()
+    total_nodes = 0
+    start = time.perf_counter()
+    for name, fen, counts in PERFT_SUITE:
+        depth = min(args.depth, len(counts))
+        ok &= run_perft(fen, depth, counts[depth - 1], args.divide, name)
+        total_nodes += counts[depth - 1]
+    elapsed = time.perf_counter() - start
+    print(f"Total: {total_nodes} feuilles en {elapsed:.2f} s "
+          f"({int(total_nodes / elapsed) if elapsed > 0 else 0} nœuds/s)"
+          f" - {'tout est correct' if ok else 'ERREURS'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,16 +6,20 @@
 ## chess_1v1.py
 
 import pygame
-import sys
-import os
 import random
-import time
 from threading import Thread
 
-# Importer les pièces d'échecs du module 1v1
-from chess_1v1 import ChessPiece, Pawn, Rook, Knight, Bishop, Queen, King, CASE_SIZE, LIGHT_BROWN, DARK_BROWN
+# Règles sans pygame (chess_game) et constantes d'affichage du module 1v1
+from chess_game import GameState, PROMOTION_NAMES
+from chess_1v1 import CASE_SIZE, LIGHT_BROWN, DARK_BROWN
+from chess_bitboard import Position, BLACK, QUEEN, row_col, move_promotion
+from chess_engine import best_capture, AI_LEVELS
+from chess_worker import SearchWorker, default_thread_count
+from chess_book import load_book, book_ply
+from chess_render import (BoardRenderer, wait_events, AI_MOVE_EVENT, IDLE_TIMEOUT_MS,
+                          PROMOTION_MESSAGE_MS)
 
-class ChessAIGame:
+class ChessAIGame(GameState):
     def __init__(self):
         # Initialisation de pygame
         pygame.init()
@@ -42,14 +46,14 @@ class ChessAIGame:
         self.font = pygame.font.SysFont("Arial", 20)
         self.title_font = pygame.font.SysFont("Arial", 24, bold=True)
         
-        # État du jeu
-        self.init_board()
+        # Rendu par rectangles modifiés (seules les zones changées sont redessinées)
+        self.renderer = BoardRenderer(self)
+        
+        # État du jeu (règles sans affichage, voir chess_game.GameState);
+        # les blancs (joueur) commencent
+        GameState.__init__(self)
         self.selected_piece = None
         self.valid_moves = []
-        self.current_player = "white"  # Les blancs (joueur) commencent
-        self.game_over = False
-        self.check_status = {"white": False, "black": False}
-        self.winner = None
         self.promotion_message = None
         self.promotion_timer = 0
         
@@ -66,129 +70,76 @@ class ChessAIGame:
         # Pour le suivi du temps de réflexion de l'IA
         self.ai_think_time_min = 1.0  # Temps minimum de réflexion en secondes
         self.ai_think_time_max = 3.0  # Temps maximum de réflexion en secondes
-    
-    def init_board(self):
-        # Initialisation du plateau (None = case vide)
-        self.board = [[None for _ in range(8)] for _ in range(8)]
-        
-        # Placement des pions
-        for col in range(8):
-            self.board[1][col] = Pawn("black", (1, col))
-            self.board[6][col] = Pawn("white", (6, col))
-        
-        # Placement des tours
-        self.board[0][0] = Rook("black", (0, 0))
-        self.board[0][7] = Rook("black", (0, 7))
-        self.board[7][0] = Rook("white", (7, 0))
-        self.board[7][7] = Rook("white", (7, 7))
-        
-        # Placement des cavaliers
-        self.board[0][1] = Knight("black", (0, 1))
-        self.board[0][6] = Knight("black", (0, 6))
-        self.board[7][1] = Knight("white", (7, 1))
-        self.board[7][6] = Knight("white", (7, 6))
-        
-        # Placement des fous
-        self.board[0][2] = Bishop("black", (0, 2))
-        self.board[0][5] = Bishop("black", (0, 5))
-        self.board[7][2] = Bishop("white", (7, 2))
-        self.board[7][5] = Bishop("white", (7, 5))
-        
-        # Placement des reines
-        self.board[0][3] = Queen("black", (0, 3))
-        self.board[7][3] = Queen("white", (7, 3))
-        
-        # Placement des rois
-        self.board[0][4] = King("black", (0, 4))
-        self.board[7][4] = King("white", (7, 4))
+        
+        # La recherche tourne dans un processus séparé, qui garde sa table de
+        # transposition d'un coup à l'autre
+        self.tt_size_mb = 16
+        self.worker = SearchWorker(self.tt_size_mb)
+        # Processus de recherche parallèle pour les niveaux difficile et expert
+        # (variable d'environnement CHESS_AI_THREADS, sinon cœurs libres)
+        self.search_threads = default_thread_count()
+        self.search_depth = 4  # Profondeur maximale de recherche (demi-coups)
+        self.last_search = None
+        # Bibliothèque d'ouvertures (lue par mmap, None si absente)
+        self.book = load_book()
+        self.book_move = False
     
     def draw_board(self):
-        # Dessiner l'échiquier
-        for row in range(8):
-            for col in range(8):
-                # Alternance des couleurs
-                if (row + col) % 2 == 0:
-                    color = self.light_brown
-                else:
-                    color = self.dark_brown
-                
-                # Position de la case
-                rect = pygame.Rect(col * self.case_size, row * self.case_size, 
-                                  self.case_size, self.case_size)
-                pygame.draw.rect(self.screen, color, rect)
-                
-                # Dessiner la pièce sur cette case
-                piece = self.board[row][col]
-                if piece:
-                    self.screen.blit(piece.image, rect)
-        
-        # Surligner la pièce sélectionnée
-        if self.selected_piece:
-            row, col = self.selected_piece.position
-            rect = pygame.Rect(col * self.case_size, row * self.case_size, 
-                              self.case_size, self.case_size)
-            # Dessiner un contour plus épais
-            pygame.draw.rect(self.screen, self.highlight_color, rect, 3)
-            
-            # Surligner les mouvements valides
-            for move_row, move_col in self.valid_moves:
-                rect = pygame.Rect(move_col * self.case_size, move_row * self.case_size, 
-                                  self.case_size, self.case_size)
-                # Dessiner un cercle au centre de la case pour indiquer un mouvement possible
-                pygame.draw.circle(self.screen, self.highlight_color, 
-                                  rect.center, self.case_size // 6)
-        
-        # Dessiner la zone d'information
-        self.draw_info_panel()
+        # Dessiner l'échiquier et la zone d'information: seules les cases et
+        # zones modifiées depuis la dernière image sont redessinées.
+        # Retourne la liste des rectangles à mettre à jour à l'écran.
+        return self.renderer.draw()
+    
+    def get_panel_state(self):
+        # Tout ce qu'affiche draw_info_panel: le panneau n'est redessiné que
+        # si cet état change
+        return (self.current_player, self.check_status["white"], self.check_status["black"],
+                self.promotion_message if self.promotion_timer > 0 else None,
+                self.game_over, self.winner,
+                self.ai_difficulty, self.ai_thinking, self.ai_message)
     
     def draw_info_panel(self):
-        # Zone d'information sur le côté droit
-        info_rect = pygame.Rect(self.board_size, 0, self.info_width, self.board_size)
-        pygame.draw.rect(self.screen, LIGHT_BROWN, info_rect)
-        pygame.draw.line(self.screen, DARK_BROWN, (self.board_size, 0), 
-                        (self.board_size, self.board_size), 2)
-        
-        # Afficher le titre
-        title = self.title_font.render("JEU D'ÉCHECS", True, DARK_BROWN)
-        self.screen.blit(title, (self.board_size + 20, 20))
+        # Zone d'information sur le côté droit: fond, séparation et titre pré-rendus
+        self.screen.blit(self.renderer.panel_background, (self.board_size, 0))
+        # Les surfaces de texte sont mises en cache par le renderer
+        text = self.renderer.render_text
         
         # Afficher le joueur actuel
         current_player_text = f"Tour: {'Joueur (Blanc)' if self.current_player == 'white' else 'IA (Noir)'}"
-        player_surf = self.font.render(current_player_text, True, DARK_BROWN)
+        player_surf = text(self.font, current_player_text, DARK_BROWN)
         self.screen.blit(player_surf, (self.board_size + 20, 60))
         
         # Afficher le niveau de difficulté de l'IA
         diff_text = f"Niveau IA: {self.ai_difficulty}"
-        diff_surf = self.font.render(diff_text, True, DARK_BROWN)
+        diff_surf = text(self.font, diff_text, DARK_BROWN)
         self.screen.blit(diff_surf, (self.board_size + 20, 90))
         
         # Message de l'IA
         if self.ai_thinking:
             ai_text = "IA réfléchit..."
-            ai_surf = self.font.render(ai_text, True, (0, 0, 200))  # Bleu
+            ai_surf = text(self.font, ai_text, (0, 0, 200))  # Bleu
             self.screen.blit(ai_surf, (self.board_size + 20, 120))
         elif self.ai_message:
-            ai_surf = self.font.render(self.ai_message, True, (0, 0, 200))  # Bleu
+            ai_surf = text(self.font, self.ai_message, (0, 0, 200))  # Bleu
             self.screen.blit(ai_surf, (self.board_size + 20, 120))
         
         # Afficher le statut d'échec
         y_offset = 150
         if self.check_status["white"]:
             check_text = "Joueur: Échec au roi!"
-            check_surf = self.font.render(check_text, True, self.check_color)
+            check_surf = text(self.font, check_text, self.check_color)
             self.screen.blit(check_surf, (self.board_size + 20, y_offset))
             y_offset += 30
         
         if self.check_status["black"]:
             check_text = "IA: Échec au roi!"
-            check_surf = self.font.render(check_text, True, self.check_color)
+            check_surf = text(self.font, check_text, self.check_color)
             self.screen.blit(check_surf, (self.board_size + 20, y_offset))
             y_offset += 30
         
         # Afficher le message de promotion (si présent)
         if self.promotion_message and self.promotion_timer > 0:
-            self.promotion_timer -= 1
-            promo_surf = self.font.render(self.promotion_message, True, (0, 128, 0))  # Vert
+            promo_surf = text(self.font, self.promotion_message, (0, 128, 0))  # Vert
             self.screen.blit(promo_surf, (self.board_size + 20, y_offset))
             y_offset += 30
         
@@ -196,18 +147,18 @@ class ChessAIGame:
         if self.game_over:
             if self.winner:
                 winner_text = f"{'Joueur' if self.winner == 'white' else 'IA'} a gagné!"
-                game_over_surf = self.title_font.render(winner_text, True, DARK_BROWN)
+                game_over_surf = text(self.title_font, winner_text, DARK_BROWN)
                 self.screen.blit(game_over_surf, (self.board_size + 20, y_offset))
                 y_offset += 40
             else:
                 draw_text = "Match nul!"
-                game_over_surf = self.title_font.render(draw_text, True, DARK_BROWN)
+                game_over_surf = text(self.title_font, draw_text, DARK_BROWN)
                 self.screen.blit(game_over_surf, (self.board_size + 20, y_offset))
                 y_offset += 40
                 
             # Bouton pour revenir au menu
             back_text = "Retour au menu"
-            back_surf = self.font.render(back_text, True, DARK_BROWN)
+            back_surf = text(self.font, back_text, DARK_BROWN)
             back_rect = pygame.Rect(self.board_size + 20, self.board_size - 50, 160, 30)
             pygame.draw.rect(self.screen, (200, 200, 200), back_rect, 0, 5)
             pygame.draw.rect(self.screen, DARK_BROWN, back_rect, 2, 5)
@@ -215,7 +166,7 @@ class ChessAIGame:
             
             # Bouton pour rejouer
             replay_text = "Nouvelle partie"
-            replay_surf = self.font.render(replay_text, True, DARK_BROWN)
+            replay_surf = text(self.font, replay_text, DARK_BROWN)
             replay_rect = pygame.Rect(self.board_size + 20, self.board_size - 100, 160, 30)
             pygame.draw.rect(self.screen, (200, 200, 200), replay_rect, 0, 5)
             pygame.draw.rect(self.screen, DARK_BROWN, replay_rect, 2, 5)
@@ -316,25 +267,23 @@ class ChessAIGame:
         
         if max_count == beginner_count and beginner_count > 0:
             self.ai_difficulty = "facile"
-            self.ai_think_time_min = 0.5
-            self.ai_think_time_max = 1.5
         elif max_count == intermediate_count and intermediate_count > 0:
             self.ai_difficulty = "moyen"
-            self.ai_think_time_min = 1.0
-            self.ai_think_time_max = 2.0
         elif max_count == advanced_count and advanced_count > 0:
             self.ai_difficulty = "difficile"
-            self.ai_think_time_min = 1.5
-            self.ai_think_time_max = 3.0
         elif max_count == master_count and master_count > 0:
             self.ai_difficulty = "expert"
-            self.ai_think_time_min = 2.0
-            self.ai_think_time_max = 4.0
         else:
             # Par défaut si aucun mot-clé n'est trouvé
             self.ai_difficulty = "moyen"
-            self.ai_think_time_min = 1.0
-            self.ai_think_time_max = 2.0
+        
+        # Temps de réflexion, profondeur et parallélisme du niveau (AI_LEVELS)
+        level = AI_LEVELS[self.ai_difficulty]
+        self.ai_think_time_min, self.ai_think_time_max = level["think_time"]
+        if level["depth"]:
+            self.search_depth = level["depth"]
+        if level["parallel"]:
+            self.worker.threads = self.search_threads
         
         self.ai_message = f"Difficulté ajustée à: {self.ai_difficulty}"
     
@@ -347,6 +296,7 @@ class ChessAIGame:
                     return "menu"
                 # Bouton "Nouvelle partie"
                 elif self.board_size - 100 <= pos[1] <= self.board_size - 70:
+                    self.close()
                     self.__init__()  # Réinitialiser le jeu
                     return "continue"
             return "continue"
@@ -378,6 +328,7 @@ class ChessAIGame:
                 if self.is_checkmate():
                     self.game_over = True
                     self.winner = "white"  # Le joueur a gagné
+                    self.worker.stop_ponder()
                 elif not self.game_over:
                     # C'est maintenant le tour de l'IA
                     self.ai_thinking = True
@@ -407,17 +358,30 @@ class ChessAIGame:
         """
         Méthode exécutée dans un thread séparé pour faire jouer l'IA.
         """
-        # Simuler un temps de réflexion pour l'IA
-        think_time = random.uniform(self.ai_think_time_min, self.ai_think_time_max)
-        time.sleep(think_time)
-        
-        # Choisir un mouvement selon la difficulté
+        # Choisir un mouvement selon la difficulté. Le temps de réflexion
+        # (ai_think_time_min / max) sert de budget à la recherche: les niveaux
+        # faciles, qui ne cherchent pas, répondent immédiatement. La recherche
+        # elle-même tourne dans le processus de calcul: ce thread ne fait
+        # qu'attendre sa réponse.
+        self.last_search = None
+        self.book_move = False
         move = self.choose_ai_move()
+        # Coup choisi sans recherche (bibliothèque, hasard...): la recherche
+        # de fond éventuelle est arrêtée (la recherche l'arrête elle-même)
+        self.worker.stop_ponder()
         
+        # Le coup est joué par la boucle principale, qui est seule à
+        # modifier le plateau affiché
+        pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, move=move))
+    
+    def apply_ai_move(self, move):
+        """
+        Joue le coup choisi par l'IA (dans la boucle principale).
+        """
         # Effectuer le mouvement
         if move:
-            piece, (to_row, to_col) = move
-            self.move_piece(piece, (to_row, to_col))
+            # (pièce, arrivée) ou (pièce, arrivée, promotion)
+            self.move_piece(*move)
             
             # Vérifier les conditions d'échec après le mouvement
             self.check_for_check()
@@ -432,7 +396,34 @@ class ChessAIGame:
             self.winner = "white"
         
         self.ai_thinking = False
-        self.ai_message = "IA a joué"
+        if self.book_move:
+            self.ai_message = "Coup de la bibliothèque"
+        elif self.last_search and self.last_search.depth:
+            # Profondeur atteinte et nœuds cherchés (en milliers)
+            self.ai_message = f"Prof. {self.last_search.depth}, {self.last_search.nodes // 1000}k nœuds"
+            if self.worker.ponder_hit:
+                self.ai_message += " (coup prévu)"
+        else:
+            self.ai_message = "IA a joué"
+        if not self.game_over:
+            self.start_pondering()
+    
+    def start_pondering(self):
+        """
+        Pendant que le joueur réfléchit, recherche de fond sur la position
+        qui suivra la réponse prévue par la variante principale (niveaux
+        avec ponder). Si le joueur joue ce coup, l'IA répond aussitôt ou
+        reprend une recherche déjà avancée; sinon la recherche est abandonnée.
+        """
+        level = AI_LEVELS.get(self.ai_difficulty)
+        result = self.last_search
+        if level is None or not level["ponder"] or result is None or not result.ponder:
+            return
+        position = Position.unpack(self.position.pack())
+        if result.ponder not in position.generate_legal_moves():
+            return
+        position.make_move(result.ponder)
+        self.worker.ponder(position, self.search_depth)
     
     def choose_ai_move(self):
         """
@@ -440,256 +431,126 @@ class ChessAIGame:
         """
         # Collecter tous les mouvements possibles pour l'IA (pièces noires)
         all_moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == "black":
-                    legal_moves = self.get_legal_moves(piece)
-                    for move in legal_moves:
-                        all_moves.append((piece, move))
+        for move in self.position.generate_legal_moves(color=BLACK):
+            # Les sous-promotions ne sont jouées que si la recherche les choisit
+            if move_promotion(move) not in (0, QUEEN):
+                continue
+            row, col = row_col(move & 63)
+            all_moves.append((self.board[row][col], row_col((move >> 6) & 63)))
         
         if not all_moves:
             return None  # Aucun mouvement possible
         
-        # Différents algorithmes selon la difficulté
-        if self.ai_difficulty == "facile":
-            # Mouvement aléatoire avec probabilité élevée (80%)
-            # ou mouvement intelligent basique (20%)
-            if random.random() < 0.8:
-                return random.choice(all_moves)
-            else:
-                return self.choose_basic_strategic_move(all_moves)
-        
-        elif self.ai_difficulty == "moyen":
-            # Mouvement aléatoire avec probabilité moyenne (40%)
-            # ou mouvement intelligent basique (60%)
-            if random.random() < 0.4:
-                return random.choice(all_moves)
-            else:
-                return self.choose_basic_strategic_move(all_moves)
-        
-        elif self.ai_difficulty == "difficile":
-            # Mouvement aléatoire avec faible probabilité (10%)
-            # ou mouvement intelligent avancé (90%)
-            if random.random() < 0.1:
-                return random.choice(all_moves)
-            else:
-                return self.choose_advanced_strategic_move(all_moves)
-        
-        elif self.ai_difficulty == "expert":
-            # Toujours choisir le meilleur mouvement disponible
+        # Dans l'ouverture, coup de la bibliothèque sans aucune recherche
+        level = AI_LEVELS.get(self.ai_difficulty)
+        if level is not None:
+            book_move = self.choose_book_move(level)
+            if book_move:
+                return book_move
+        
+        # Différents algorithmes selon la difficulté (voir AI_LEVELS): un
+        # coup au hasard avec la probabilité du niveau, sinon la stratégie
+        # de base (captures) ou la recherche
+        if level is None or random.random() < level["random"]:
+            return random.choice(all_moves)
+        if level["strategy"] == "search":
             return self.choose_advanced_strategic_move(all_moves)
-        
-        # Par défaut, retourner un mouvement aléatoire
-        return random.choice(all_moves)
-    
-    def choose_basic_strategic_move(self, all_moves):
-        """
-        Stratégie de base pour l'IA: capture si possible, sinon mouvement aléatoire.
-        """
-        # Vérifier s'il y a des mouvements qui permettent de capturer une pièce
-        capture_moves = []
-        for piece, move in all_moves:
-            row, col = move
-            if self.board[row][col] is not None:
-                # Évaluer la valeur de la pièce capturée
-                captured_piece = self.board[row][col]
-                value = self.get_piece_value(captured_piece)
-                capture_moves.append((piece, move, value))
-        
-        if capture_moves:
-            # Prendre la capture qui offre la pièce de plus grande valeur
-            capture_moves.sort(key=lambda x: x[2], reverse=True)
-            return (capture_moves[0][0], capture_moves[0][1])
-        
-        # Si pas de capture, choisir un mouvement aléatoire
-        return random.choice(all_moves)
+        return self.choose_basic_strategic_move(all_moves)
     
-    def choose_advanced_strategic_move(self, all_moves):
+    def choose_book_move(self, level):
         """
-        Stratégie avancée pour l'IA: évaluer chaque mouvement et choisir le meilleur.
+        Coup de la bibliothèque d'ouvertures pendant les book_depth premiers
+        demi-coups du niveau, ou None.
         """
-        best_move = None
-        best_score = float('-inf')
-        
-        for piece, move in all_moves:
-            # Simuler le mouvement
-            old_row, old_col = piece.position
-            to_row, to_col = move
-            captured_piece = self.board[to_row][to_col]
-            
-            # Effectuer le mouvement temporairement
-            self.board[old_row][old_col] = None
-            self.board[to_row][to_col] = piece
-            old_position = piece.position
-            piece.position = (to_row, to_col)
-            
-            # Évaluer la position
-            score = self.evaluate_board()
-            
-            # Annuler le mouvement
-            piece.position = old_position
-            self.board[old_row][old_col] = piece
-            self.board[to_row][to_col] = captured_piece
-            
-            # Mettre à jour le meilleur mouvement
-            if score > best_score:
-                best_score = score
-                best_move = (piece, move)
-        
-        return best_move
+        if self.book is None or book_ply(self.position) >= level["book_depth"]:
+            return None
+        move = self.book.probe(self.position, level["book_weighting"])
+        if not move:
+            return None
+        self.book_move = True
+        from_row, from_col = row_col(move & 63)
+        return (self.board[from_row][from_col], row_col((move >> 6) & 63), move_promotion(move))
     
-    def evaluate_board(self):
+    def choose_basic_strategic_move(self, all_moves):
         """
-        Évalue la position actuelle du plateau du point de vue de l'IA (noir).
-        Une valeur positive indique un avantage pour l'IA.
+        Stratégie de base pour l'IA: la prise qui gagne le plus de matériel
+        d'après l'échange statique (chess_engine.see), sinon un mouvement aléatoire.
         """
-        score = 0
-        
-        # Valeur des pièces
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece:
-                    value = self.get_piece_value(piece)
-                    if piece.color == "black":
-                        score += value
-                    else:
-                        score -= value
-        
-        # Bonus pour le contrôle du centre
-        center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-        for row, col in center_squares:
-            piece = self.board[row][col]
-            if piece:
-                if piece.color == "black":
-                    score += 0.5
-                else:
-                    score -= 0.5
+        moves = [self.to_bitboard_move(piece, move) for piece, move in all_moves]
+        capture = best_capture(self.position, moves)
+        if capture:
+            return all_moves[moves.index(capture)]
         
-        # Bonus pour les pièces développées (simplifié)
-        for col in range(8):
-            # Vérifier si les pions ont été déplacés
-            if self.board[1][col] is None or self.board[1][col].piece_type != "pawn":
-                score += 0.2  # Bonus pour les pions développés
-            
-            if self.board[6][col] is None or self.board[6][col].piece_type != "pawn":
-                score -= 0.2  # Malus pour les pions adverses développés
-        
-        return score
+        # Si pas de prise avantageuse, choisir un mouvement aléatoire
+        return random.choice(all_moves)
     
-    def get_piece_value(self, piece):
+    def choose_advanced_strategic_move(self, all_moves):
         """
-        Retourne la valeur d'une pièce d'échecs.
+        Stratégie avancée pour l'IA: recherche alpha-bêta (négamax) avec
+        approfondissement itératif, dans le budget de temps de la difficulté
+        et jusqu'à self.search_depth demi-coups au plus.
         """
-        if piece is None:
-            return 0
-        
-        if piece.piece_type == "pawn":
-            return 1
-        elif piece.piece_type == "knight" or piece.piece_type == "bishop":
-            return 3
-        elif piece.piece_type == "rook":
-            return 5
-        elif piece.piece_type == "queen":
-            return 9
-        elif piece.piece_type == "king":
-            return 100  # Valeur élevée pour le roi
-        
-        return 0
-    
-    def move_piece(self, piece, new_position):
-        old_row, old_col = piece.position
-        new_row, new_col = new_position
-        self.board[old_row][old_col] = None
-        self.board[new_row][new_col] = piece
-        piece.position = new_position
-        piece.has_moved = True
-        if piece.piece_type == "pawn":
-            if (piece.color == "white" and new_row == 0) or (piece.color == "black" and new_row == 7):
-                self.board[new_row][new_col] = Queen(piece.color, (new_row, new_col))
-                self.promotion_message = f"Promotion du pion en Dame!"
-                self.promotion_timer = 100
-        self.current_player = "black" if self.current_player == "white" else "white"
+        result = self.worker.search(self.position, self.ai_think_time_min,
+                                    self.ai_think_time_max, self.search_depth)
+        self.last_search = result
+        move = result.move
+        if not move:
+            return random.choice(all_moves)
+        from_row, from_col = row_col(move & 63)
+        return (self.board[from_row][from_col], row_col((move >> 6) & 63), move_promotion(move))
     
-    def get_legal_moves(self, piece):
-        moves = piece.get_valid_moves(self.board)
-        legal_moves = []
-        for move in moves:
-            if not self.would_be_in_check_after_move(piece, move):
-                legal_moves.append(move)
-        return legal_moves
+    def move_piece(self, piece, new_position, promotion=QUEEN):
+        promoted = GameState.move_piece(self, piece, new_position, promotion)
+        if promoted:
+            # Afficher un message temporaire de promotion
+            self.promotion_message = f"Promotion du pion en {PROMOTION_NAMES[promoted]}!"
+            self.promotion_timer = PROMOTION_MESSAGE_MS
+        return promoted
     
-    def would_be_in_check_after_move(self, piece, move):
-        old_row, old_col = piece.position
-        new_row, new_col = move
-        old_piece_at_target = self.board[new_row][new_col]
-        self.board[old_row][old_col] = None
-        self.board[new_row][new_col] = piece
-        piece.position = move
-        king_position = self.find_king(piece.color)
-        is_in_check = self.is_position_attacked(king_position, 
-                                              "black" if piece.color == "white" else "white")
-        self.board[old_row][old_col] = piece
-        self.board[new_row][new_col] = old_piece_at_target
-        piece.position = (old_row, old_col)
-        return is_in_check
-    
-    def find_king(self, color):
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.piece_type == "king" and piece.color == color:
-                    return (row, col)
-        return None
-    
-    def is_position_attacked(self, position, by_color):
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == by_color:
-                    if piece.piece_type == "king":
-                        king_row, king_col = piece.position
-                        pos_row, pos_col = position
-                        if abs(king_row - pos_row) <= 1 and abs(king_col - pos_col) <= 1:
-                            return True
-                    else:
-                        moves = piece.get_valid_moves(self.board)
-                        if position in moves:
-                            return True
-        return False
-    
-    def check_for_check(self):
-        white_king_pos = self.find_king("white")
-        black_king_pos = self.find_king("black")
-        self.check_status["white"] = self.is_position_attacked(white_king_pos, "black")
-        self.check_status["black"] = self.is_position_attacked(black_king_pos, "white")
-    
-    def is_checkmate(self):
-        color = self.current_player
-        if not self.check_status[color]:
+    def undo_move(self):
+        # Annuler le dernier coup et la sélection en cours
+        if not GameState.undo_move(self):
             return False
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == color:
-                    legal_moves = self.get_legal_moves(piece)
-                    if legal_moves:
-                        return False
+        self.selected_piece = None
+        self.valid_moves = []
         return True
     
+    def close(self):
+        # Arrêter le processus de calcul de l'IA et fermer la bibliothèque
+        self.worker.close()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+    
+    def event_timeout(self):
+        # Au repos on dort jusqu'au prochain événement (le thread de l'IA
+        # poste AI_MOVE_EVENT); un message temporaire réveille la boucle
+        # à son expiration
+        if self.promotion_timer > 0:
+            return min(self.promotion_timer, IDLE_TIMEOUT_MS)
+        return IDLE_TIMEOUT_MS
+    
     def run(self):
-        clock = pygame.time.Clock()
+        last_tick = pygame.time.get_ticks()
         running = True
+        skill_state = None
         while running:
             if not self.skill_description_entered:
-                self.draw_skill_input()
-                for event in pygame.event.get():
+                # L'écran de saisie n'est redessiné que si son contenu change
+                if skill_state != (self.text_input, self.input_active):
+                    skill_state = (self.text_input, self.input_active)
+                    self.draw_skill_input()
+                    pygame.display.flip()
+                for event in wait_events():
                     if event.type == pygame.QUIT:
                         return "quit"
+                    elif event.type == pygame.WINDOWEXPOSED:
+                        skill_state = None
                     self.handle_skill_input(event)
+                if self.skill_description_entered:
+                    self.renderer.invalidate()
             else:
-                for event in pygame.event.get():
+                for event in wait_events(self.event_timeout()):
                     if event.type == pygame.QUIT:
                         return "quit"
                     elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -697,14 +558,31 @@ class ChessAIGame:
                             result = self.handle_click(event.pos)
                             if result == "menu":
                                 return "menu"
-                self.draw_board()
-            pygame.display.flip()
-            clock.tick(60)
+                    elif event.type == pygame.KEYDOWN:
+                        # Annuler le dernier coup de l'IA et celui du joueur
+                        if event.key == pygame.K_BACKSPACE and not self.ai_thinking:
+                            self.worker.stop_ponder()
+                            self.undo_move()
+                            if self.current_player == "black":
+                                self.undo_move()
+                    elif event.type == pygame.WINDOWEXPOSED:
+                        self.renderer.invalidate()
+                    elif event.type == AI_MOVE_EVENT:
+                        # Coup choisi par le thread de l'IA
+                        self.apply_ai_move(event.move)
+                now = pygame.time.get_ticks()
+                if self.promotion_timer > 0:
+                    self.promotion_timer = max(0, self.promotion_timer - (now - last_tick))
+                last_tick = now
+                dirty = self.draw_board()
+                if dirty:
+                    pygame.display.update(dirty)
         return "quit"
 
 def main():
     game = ChessAIGame()
     result = game.run()
+    game.close()
     pygame.quit()
     return result
 
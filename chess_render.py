@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_render.py
+
+import os
+
+import pygame
+
+# Nombre maximal de surfaces de texte gardées en cache
+TEXT_CACHE_SIZE = 256
+
+# Événement posté par le thread de l'IA quand son coup est choisi (attribut move)
+AI_MOVE_EVENT = pygame.USEREVENT + 1
+
+# Attente maximale sans événement (ms)
+IDLE_TIMEOUT_MS = 1000
+
+# Durée d'affichage du message de promotion (ms)
+PROMOTION_MESSAGE_MS = 1600
+
+
+def wait_events(timeout_ms=IDLE_TIMEOUT_MS):
+    """
+    Bloque jusqu'au prochain événement (ou jusqu'à l'expiration du délai)
+    puis retourne tous les événements en attente. Au repos, la boucle dort
+    ici au lieu de redessiner 60 fois par seconde.
+    """
+    event = pygame.event.wait(max(1, int(timeout_ms)))
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+
+# Atlas des sprites: chaque image de assets/ est chargée et convertie une
+# seule fois par taille de case, puis partagée par toutes les pièces
+_sprite_cache = {}
+
+
+def get_sprite(piece_type, color, size):
+    key = (piece_type, color, size)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        image_name = f"{piece_type}_{color}.png"
+        image_path = os.path.join("assets", image_name)
+        try:
+            sprite = pygame.image.load(image_path)
+            sprite = pygame.transform.scale(sprite, (size, size))
+            # Conversion au format de l'écran (possible une fois la fenêtre créée)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            print(f"Impossible de charger l'image: {image_path}")
+            # Créer une image de remplacement si l'image ne peut pas être chargée
+            sprite = pygame.Surface((size, size))
+            sprite.fill((255, 0, 0))  # Rouge pour indiquer une erreur
+        _sprite_cache[key] = sprite
+    return sprite
+
+
+class TextCache:
+    """
+    Cache des surfaces de texte rendues, indexé par (police, texte, couleur).
+
+    Le rendu d'une police est coûteux: une chaîne déjà rendue avec la même
+    police et la même couleur est réutilisée telle quelle, une nouvelle
+    chaîne ou couleur donne une nouvelle entrée.
+    """
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.surfaces = {}
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.size:
+                # Textes dynamiques (messages de l'IA...): on repart de zéro
+                self.surfaces.clear()
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+        return surface
+
+
+class BoardRenderer:
+    """
+    Rendu en mode retenu de l'échiquier et du panneau d'information.
+
+    Le renderer garde l'état affiché de chaque case (pièce, sélection,
+    indicateur de coup) et du panneau. À chaque image, seules les cases et
+    la zone du panneau dont l'état a changé sont redessinées, et la liste
+    des rectangles modifiés est retournée pour pygame.display.update(rects).
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.square_states = [None] * 64
+        self.panel_state = None
+        self.full_redraw = True
+        self.panel_rect = pygame.Rect(game.board_size, 0, game.info_width, game.board_size)
+        size = game.case_size
+        self.square_rects = [pygame.Rect(col * size, row * size, size, size)
+                             for row in range(8) for col in range(8)]
+        self.text = TextCache()
+        self.board_background = self.render_board_background()
+        self.panel_background = self.render_panel_background()
+
+    def render_board_background(self):
+        # Damier vide, dessiné une seule fois
+        game = self.game
+        surface = pygame.Surface((game.board_size, game.board_size))
+        for index, rect in enumerate(self.square_rects):
+            row, col = divmod(index, 8)
+            # Alternance des couleurs
+            color = game.light_brown if (row + col) % 2 == 0 else game.dark_brown
+            pygame.draw.rect(surface, color, rect)
+        return surface
+
+    def render_panel_background(self):
+        # Fond, séparation et titre du panneau d'information
+        game = self.game
+        surface = pygame.Surface(self.panel_rect.size)
+        surface.fill(game.light_brown)
+        pygame.draw.line(surface, game.dark_brown, (0, 0), (0, game.board_size), 2)
+        surface.blit(self.render_text(game.title_font, "JEU D'ÉCHECS", game.dark_brown), (20, 20))
+        return surface
+
+    def render_text(self, font, text, color):
+        return self.text.render(font, text, color)
+
+    def invalidate(self):
+        # Forcer un rendu complet à la prochaine image (nouvel écran, nouvelle partie...)
+        self.full_redraw = True
+
+    def draw(self):
+        game = self.game
+        dirty = []
+        full = self.full_redraw
+        self.full_redraw = False
+        selected = game.selected_piece.position if game.selected_piece else None
+        targets = set(game.valid_moves) if selected else ()
+        if full:
+            # Tout le damier d'un seul blit, les cases sont redessinées par-dessus
+            game.screen.blit(self.board_background, (0, 0))
+
+        for row in range(8):
+            for col in range(8):
+                piece = game.board[row][col]
+                state = (get_sprite(piece.piece_type, piece.color, game.case_size) if piece else None,
+                         (row, col) == selected,
+                         (row, col) in targets)
+                index = row * 8 + col
+                if not full and state == self.square_states[index]:
+                    continue
+                self.square_states[index] = state
+                rect = self.square_rects[index]
+                self.draw_square(rect, state, full)
+                dirty.append(rect)
+
+        panel_state = game.get_panel_state()
+        if full or panel_state != self.panel_state:
+            self.panel_state = panel_state
+            game.draw_info_panel()
+            dirty.append(self.panel_rect)
+        return dirty
+
+    def draw_square(self, rect, state, background_drawn=False):
+        game = self.game
+        image, is_selected, is_target = state
+        if not background_drawn:
+            # Recopier la case vide depuis le damier pré-rendu
+            game.screen.blit(self.board_background, rect, rect)
+        if image is not None:
+            game.screen.blit(image, rect)
+        if is_selected:
+            # Contour plus épais autour de la pièce sélectionnée
+            pygame.draw.rect(game.screen, game.highlight_color, rect, 3)
+        if is_target:
+            # Cercle au centre de la case pour indiquer un mouvement possible
+            pygame.draw.circle(game.screen, game.highlight_color,
+                               rect.center, game.case_size // 6)
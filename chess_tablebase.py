@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_tablebase.py
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from itertools import combinations_with_replacement
+
+from chess_bitboard import (Position, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FEN_PIECES,
+                            KING_ATTACKS, PAWN_ATTACKS, piece_attacks, iter_bits, move_to_uci)
+
+# Tables de finales à 3 et 4 pièces (rois compris), calculées hors ligne par
+# analyse rétrograde. Une table par jeu de pièces ("KQvK", "KRvKP"...), le
+# camp le plus fort en blanc; un octet par position:
+#   bits 0-1  résultat pour le camp au trait (nul, gain, perte, illégale)
+#   bits 2-7  distance au mat en coups (gain en n: mat donné au coup n,
+#             perte en n: mat subi après n coups)
+# Les positions sont indexées par (trait, case du roi blanc ramenée par
+# symétrie, cases des autres pièces); la prise en passant et le roque ne
+# sont pas représentés (voir Tablebases.probe).
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebases")
+TABLE_SUFFIX = ".tb"
+MAX_MEN = 4
+
+DRAW = 0
+WIN = 1
+LOSS = 2
+ILLEGAL = 3
+MAX_DTM = 63
+
+# Pièces pouvant accompagner les rois, de la plus forte à la plus faible
+PIECE_ORDER = (QUEEN, ROOK, BISHOP, KNIGHT, PAWN)
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+# Cases du roi blanc après symétrie: triangle a1-d1-d4 sans pion (8
+# symétries), colonnes a à d avec des pions (symétrie gauche-droite seulement)
+TRIANGLE = (0, 1, 2, 3, 9, 10, 11, 18, 19, 27)
+PAWNLESS_KING_SLOTS = [TRIANGLE.index(sq) if sq in TRIANGLE else -1 for sq in range(64)]
+PAWN_KING_SLOTS = [(sq >> 3) * 4 + (sq & 7) if sq & 7 < 4 else -1 for sq in range(64)]
+
+
+def _transforms():
+    # Les 8 symétries de l'échiquier, sous forme de tableaux case -> case
+    table = []
+    for flip_file in (False, True):
+        for flip_rank in (False, True):
+            for swap in (False, True):
+                mapping = []
+                for sq in range(64):
+                    rank, file = sq >> 3, sq & 7
+                    if swap:
+                        rank, file = file, rank
+                    if flip_file:
+                        file = 7 - file
+                    if flip_rank:
+                        rank = 7 - rank
+                    mapping.append(rank * 8 + file)
+                table.append(mapping)
+    return table
+
+
+TRANSFORMS = _transforms()
+# Symétries qui ramènent le roi blanc de chaque case dans le triangle
+KING_TRANSFORMS = [[mapping for mapping in TRANSFORMS if mapping[sq] in TRIANGLE] for sq in range(64)]
+
+
+def material_name(white_types, black_types):
+    """
+    Nom d'un jeu de pièces (hors rois): material_name([ROOK], [PAWN]) -> "KRvKP".
+    """
+    def side(types):
+        return "K" + "".join(FEN_PIECES[ptype].upper() for ptype in sorted(types, reverse=True))
+    return side(white_types) + "v" + side(black_types)
+
+
+def material_types(name):
+    # Conversion inverse: "KRvKP" -> ([ROOK], [PAWN])
+    white, black = name.split("v")
+    return ([FEN_PIECES.index(char.lower()) for char in white[1:]],
+            [FEN_PIECES.index(char.lower()) for char in black[1:]])
+
+
+def _strength(types):
+    return (len(types), sorted(types, reverse=True))
+
+
+def table_orientation(white_types, black_types):
+    """
+    Table d'un jeu de pièces: (nom, couleurs inversées?). Les tables sont
+    calculées avec le camp le plus fort en blanc.
+    """
+    if _strength(black_types) > _strength(white_types):
+        return material_name(black_types, white_types), True
+    return material_name(white_types, black_types), False
+
+
+def all_tables(max_men=MAX_MEN):
+    """
+    Noms de toutes les tables jusqu'à max_men pièces, dans un ordre où
+    chaque table ne dépend que des précédentes (moins de pièces, puis moins
+    de pions: une promotion ou une prise mène toujours à une table déjà faite).
+    """
+    names = set()
+    for men in range(3, max_men + 1):
+        for count in range(men - 1):
+            for white in combinations_with_replacement(PIECE_ORDER, men - 2 - count):
+                for black in combinations_with_replacement(PIECE_ORDER, count):
+                    names.add(table_orientation(list(white), list(black))[0])
+    return sorted(names, key=_generation_order)
+
+
+def _generation_order(name):
+    white, black = material_types(name)
+    types = white + black
+    return (len(types), types.count(PAWN), name)
+
+
+def table_dependencies(name):
+    # Tables atteintes par une prise ou une promotion depuis la table name
+    white, black = material_types(name)
+    found = set()
+    for types, other, is_white in ((white, black, True), (black, white, False)):
+        for index, ptype in enumerate(types):
+            rest = types[:index] + types[index + 1:]
+            changes = [rest] + ([rest + [promoted] for promoted in PROMOTIONS] if ptype == PAWN else [])
+            for changed in changes:
+                pair = (changed, other) if is_white else (other, changed)
+                if pair[0] or pair[1]:
+                    found.add(table_orientation(*pair)[0])
+    return found
+
+
+class Table:
+    """
+    Table d'un jeu de pièces: pièces dans l'ordre roi blanc, roi noir,
+    pièces blanches puis noires (de la plus forte à la plus faible), et un
+    octet par position (data: mmap ou bytearray).
+    """
+
+    def __init__(self, name, data=None):
+        self.name = name
+        white, black = material_types(name)
+        self.pieces = ([(WHITE, KING), (BLACK, KING)] + [(WHITE, ptype) for ptype in white]
+                       + [(BLACK, ptype) for ptype in black])
+        self.pawns = PAWN in white or PAWN in black
+        self.king_slots = PAWN_KING_SLOTS if self.pawns else PAWNLESS_KING_SLOTS
+        self.king_count = 32 if self.pawns else 10
+        self.per_side = self.king_count * 64 ** (len(self.pieces) - 1)
+        self.size = 2 * self.per_side
+        self.data = data
+
+    def canonical(self, squares):
+        # Cases après la symétrie qui place le roi blanc dans sa zone; sans
+        # pion, le roi sur la diagonale laisse deux symétries: on garde la
+        # plus petite suite de cases pour que chaque position ait un seul index
+        if self.pawns:
+            if squares[0] & 7 > 3:
+                return tuple(sq ^ 7 for sq in squares)
+            return tuple(squares)
+        return min(tuple(mapping[sq] for sq in squares) for mapping in KING_TRANSFORMS[squares[0]])
+
+    def index(self, side, squares):
+        # squares doit être canonique (voir canonical)
+        index = side * self.king_count + self.king_slots[squares[0]]
+        for sq in squares[1:]:
+            index = index * 64 + sq
+        return index
+
+    def decode(self, index):
+        squares = []
+        for _ in range(len(self.pieces) - 1):
+            index, sq = divmod(index, 64)
+            squares.append(sq)
+        side, slot = divmod(index, self.king_count)
+        king = (TRIANGLE[slot] if not self.pawns else (slot >> 2) * 8 + (slot & 3))
+        squares.append(king)
+        return side, tuple(reversed(squares))
+
+    def value(self, side, squares):
+        return self.data[self.index(side, self.canonical(squares))]
+
+
+def _attacked(pieces, squares, target, by_color, occ, captured=-1):
+    # La case target est-elle attaquée par les pièces by_color (sauf la pièce
+    # d'indice captured, qui vient d'être prise)?
+    bit = 1 << target
+    for index, (color, ptype) in enumerate(pieces):
+        if color != by_color or index == captured:
+            continue
+        sq = squares[index]
+        if ptype == PAWN:
+            if PAWN_ATTACKS[color][sq] & bit:
+                return True
+        elif ptype == KING:
+            if KING_ATTACKS[sq] & bit:
+                return True
+        elif piece_attacks(ptype, color, sq, occ) & bit:
+            return True
+    return False
+
+
+def _pawn_pushes(color, sq, occ):
+    # Poussées d'un pion (une ou deux cases depuis la rangée de départ)
+    step = 8 if color == WHITE else -8
+    targets = 0
+    to = sq + step
+    if not occ >> to & 1:
+        targets |= 1 << to
+        start = 1 if color == WHITE else 6
+        if sq >> 3 == start and not occ >> (to + step) & 1:
+            targets |= 1 << (to + step)
+    return targets
+
+
+def _legal(table, side, squares):
+    # Position représentable et légale: cases distinctes, rois non voisins,
+    # pas de pion sur la première ou la dernière rangée, camp qui n'a pas le
+    # trait pas en échec
+    if len(set(squares)) != len(squares) or KING_ATTACKS[squares[0]] >> squares[1] & 1:
+        return False
+    occ = 0
+    for (_, ptype), sq in zip(table.pieces, squares):
+        if ptype == PAWN and sq >> 3 in (0, 7):
+            return False
+        occ |= 1 << sq
+    return not _attacked(table.pieces, squares, squares[side ^ 1], side, occ)
+
+
+class Tablebases:
+    """
+    Accès aux tables d'un dossier: chaque fichier est ouvert par mmap à sa
+    première consultation. max_men vaut 0 si le dossier est vide ou absent,
+    ce qui rend les consultations gratuites.
+    """
+
+    def __init__(self, directory=TABLEBASE_DIR):
+        self.directory = directory
+        self.tables = {}
+        self.files = []
+        self.max_men = 0
+        try:
+            names = [name[:-len(TABLE_SUFFIX)] for name in os.listdir(directory)
+                     if name.endswith(TABLE_SUFFIX)]
+        except OSError:
+            names = []
+        for name in names:
+            try:
+                white, black = material_types(name)
+            except ValueError:
+                continue
+            self.tables[name] = False  # Pas encore ouverte
+            self.max_men = max(self.max_men, len(white) + len(black) + 2)
+
+    def add(self, table):
+        # Table déjà en mémoire (pendant la génération)
+        self.tables[table.name] = table
+        self.max_men = max(self.max_men, len(table.pieces))
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is False:
+            table = None
+            path = os.path.join(self.directory, name + TABLE_SUFFIX)
+            try:
+                file = open(path, "rb")
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.files.append(file)
+                table = Table(name, data)
+                if len(data) != table.size:
+                    print(f"Table de finale invalide: {path}")
+                    table = None
+            except (OSError, ValueError) as e:
+                print(f"Impossible de lire la table de finale {path}: {e}")
+            self.tables[name] = table
+        return table
+
+    def lookup(self, pieces, side):
+        """
+        Octet de la table pour une liste de (couleur, type, case) et le camp
+        au trait, ou None si la table n'est pas disponible.
+        """
+        white = sorted(((ptype, sq) for color, ptype, sq in pieces if color == WHITE and ptype != KING),
+                       reverse=True)
+        black = sorted(((ptype, sq) for color, ptype, sq in pieces if color == BLACK and ptype != KING),
+                       reverse=True)
+        kings = [0, 0]
+        for color, ptype, sq in pieces:
+            if ptype == KING:
+                kings[color] = sq
+        if not white and not black:
+            return DRAW  # Roi contre roi
+        name, flipped = table_orientation([ptype for ptype, _ in white], [ptype for ptype, _ in black])
+        squares = kings + [sq for _, sq in white] + [sq for _, sq in black]
+        if flipped:
+            # Le camp fort passe en blanc: échiquier retourné, couleurs échangées
+            squares = ([kings[1], kings[0]] + [sq for _, sq in black] + [sq for _, sq in white])
+            squares = [sq ^ 56 for sq in squares]
+            side ^= 1
+        table = self.table(name)
+        if table is None:
+            return None
+        return table.value(side, squares)
+
+    def covers(self, position):
+        # Position candidate: assez peu de pièces, ni roque ni prise en passant
+        return (len(position.piece_lists[WHITE]) + len(position.piece_lists[BLACK]) <= self.max_men
+                and not position.castling and position.ep < 0)
+
+    def probe(self, position):
+        """
+        (résultat, distance au mat en coups) pour le camp au trait, ou None
+        si la position n'est pas dans les tables.
+        """
+        if not self.covers(position):
+            return None
+        squares = position.squares
+        pieces = [(color, squares[sq][1], sq) for color in (WHITE, BLACK)
+                  for sq in position.piece_lists[color]]
+        value = self.lookup(pieces, position.side)
+        if value is None:
+            return None
+        return value & 3, value >> 2
+
+    def best_move(self, position):
+        """
+        Coup parfait d'après les tables: (coup, résultat, distance au mat en
+        coups) du point de vue du camp au trait, ou None si une des positions
+        atteintes n'est pas dans les tables. On gagne au plus vite, on
+        annule si possible, et on retarde le mat au plus tard sinon.
+        """
+        if not self.covers(position):
+            return None
+        best = None
+        for move in position.generate_legal_moves():
+            position.make_move(move)
+            entry = self.probe(position)
+            position.unmake_move()
+            if entry is None:
+                return None
+            result, dtm = entry
+            if result == LOSS:
+                key, ours = (0, dtm), (WIN, dtm + 1)
+            elif result == WIN:
+                key, ours = (2, -dtm), (LOSS, dtm)
+            else:
+                key, ours = (1, 0), (DRAW, 0)
+            if best is None or key < best[0]:
+                best = (key, move, ours)
+        if best is None:
+            return None
+        return best[1], best[2][0], best[2][1]
+
+    def close(self):
+        for table in self.tables.values():
+            if table and isinstance(table.data, mmap.mmap):
+                table.data.close()
+        for file in self.files:
+            file.close()
+        self.tables = {}
+        self.files = []
+        self.max_men = 0
+
+
+_default_tablebases = None
+
+
+def default_tablebases():
+    # Tables du dossier du jeu, ouvertes une fois par processus
+    global _default_tablebases
+    if _default_tablebases is None:
+        _default_tablebases = Tablebases()
+    return _default_tablebases
+
+
+def generate_table(name, tablebases, log=None):
+    """
+    Calcule la table name par analyse rétrograde. Les tables atteintes par
+    une prise ou une promotion doivent déjà être dans tablebases.
+
+    Chaque position légale compte ses coups vers des positions distinctes
+    de la même table; les prises et promotions sont résolues tout de suite
+    avec les autres tables. Puis, demi-coup par demi-coup en partant des
+    mats: les prédécesseurs (coups retournés) d'une position perdue sont
+    gagnants, et un prédécesseur d'une position gagnante est perdant quand
+    tous ses coups mènent à des positions gagnantes pour l'adversaire.
+    """
+    table = Table(name)
+    pieces = table.pieces
+    size = table.size
+    values = bytearray(size)        # 0: pas encore résolue (nulle à la fin)
+    counts = bytearray(size)        # coups vers la même table non résolus
+    safe = bytearray(size)          # une prise ou promotion annule ou gagne
+    conversion_loss = bytearray(size)  # perte la plus lente par prise (demi-coups)
+    pending = {}                    # demi-coups -> [(index, résultat)]
+    start = time.perf_counter()
+
+    def moves_from(side, squares):
+        # Coups légaux: liste de (index dans la table, None) ou (None, octet
+        # de la table atteinte par une prise ou une promotion)
+        occ_color = [0, 0]
+        for (color, _), sq in zip(pieces, squares):
+            occ_color[color] |= 1 << sq
+        occ = occ_color[0] | occ_color[1]
+        king = squares[side]
+        result = []
+        for index, (color, ptype) in enumerate(pieces):
+            if color != side:
+                continue
+            frm = squares[index]
+            if ptype == PAWN:
+                targets = _pawn_pushes(color, frm, occ) | PAWN_ATTACKS[color][frm] & occ_color[color ^ 1]
+            else:
+                targets = piece_attacks(ptype, color, frm, occ) & ~occ_color[color]
+            for to in iter_bits(targets):
+                captured = squares.index(to) if occ_color[color ^ 1] >> to & 1 else -1
+                moved = list(squares)
+                moved[index] = to
+                new_occ = (occ ^ (1 << frm)) | (1 << to)
+                if _attacked(pieces, moved, to if index == side else king, side ^ 1, new_occ, captured):
+                    continue
+                promote = ptype == PAWN and to >> 3 in (0, 7)
+                if captured < 0 and not promote:
+                    result.append((table.index(side ^ 1, table.canonical(moved)), None))
+                    continue
+                for promoted in (PROMOTIONS if promote else (ptype,)):
+                    child = [(c, promoted if i == index else t, moved[i])
+                             for i, (c, t) in enumerate(pieces) if i != captured]
+                    result.append((None, tablebases.lookup(child, side ^ 1)))
+        return result
+
+    # Passe initiale: positions illégales, mats, pats et conversions
+    for index in range(size):
+        side, squares = table.decode(index)
+        if table.canonical(squares) != squares or not _legal(table, side, squares):
+            values[index] = ILLEGAL
+            continue
+        children = set()
+        best_win = 0
+        moves = moves_from(side, squares)
+        for child, value in moves:
+            if child is not None:
+                children.add(child)
+                continue
+            result, dtm = value & 3, value >> 2
+            if result == LOSS:
+                plies = 2 * dtm + 1
+                if not best_win or plies < best_win:
+                    best_win = plies
+            elif result == WIN:
+                conversion_loss[index] = max(conversion_loss[index], min(2 * dtm, 255))
+            else:
+                safe[index] = 1
+        counts[index] = len(children)
+        if not moves:
+            if _attacked(pieces, squares, squares[side], side ^ 1,
+                         sum(1 << sq for sq in squares)):
+                pending.setdefault(0, []).append((index, LOSS))
+            continue  # Pat: nulle
+        if best_win:
+            pending.setdefault(best_win, []).append((index, WIN))
+        if not children and not safe[index] and not best_win:
+            pending.setdefault(conversion_loss[index], []).append((index, LOSS))
+
+    def store(index, result, plies):
+        moves = (plies + 1) // 2 if result == WIN else plies // 2
+        values[index] = result | min(moves, MAX_DTM) << 2
+
+    # Propagation demi-coup par demi-coup
+    plies = 0
+    current = []
+    resolved = 0
+    while pending or current:
+        for index, result in pending.pop(plies, ()):
+            if not values[index]:
+                store(index, result, plies)
+                current.append(index)
+        following = []
+        for index in current:
+            resolved += 1
+            side, squares = table.decode(index)
+            lost = values[index] & 3 == LOSS
+            mover = side ^ 1
+            occ = 0
+            for sq in squares:
+                occ |= 1 << sq
+            predecessors = set()
+            for piece, (color, ptype) in enumerate(pieces):
+                if color != mover:
+                    continue
+                sq = squares[piece]
+                if ptype == PAWN:
+                    step = -8 if color == WHITE else 8
+                    origins = []
+                    frm = sq + step
+                    if 8 <= frm < 56 and not occ >> frm & 1:
+                        origins.append(frm)
+                        if sq >> 3 == (3 if color == WHITE else 4) and not occ >> (frm + step) & 1:
+                            origins.append(frm + step)
+                else:
+                    origins = iter_bits(piece_attacks(ptype, color, sq, occ) & ~occ)
+                for frm in origins:
+                    moved = list(squares)
+                    moved[piece] = frm
+                    predecessors.add(table.index(mover, table.canonical(moved)))
+            for previous in predecessors:
+                if values[previous]:
+                    continue
+                if lost:
+                    store(previous, WIN, plies + 1)
+                    following.append(previous)
+                    continue
+                counts[previous] -= 1
+                if counts[previous] or safe[previous]:
+                    continue
+                loss_plies = max(plies + 1, conversion_loss[previous])
+                if loss_plies == plies + 1:
+                    store(previous, LOSS, loss_plies)
+                    following.append(previous)
+                else:
+                    pending.setdefault(loss_plies, []).append((previous, LOSS))
+        current = following
+        plies += 1
+    if log:
+        longest = max((value >> 2 for value in values if value & 3 in (WIN, LOSS)), default=0)
+        log(f"{name}: {resolved} positions gagnées ou perdues, mat le plus long en "
+            f"{longest} coups ({time.perf_counter() - start:.1f} s)")
+    table.data = values
+    return table
+
+
+def generate(names, directory=TABLEBASE_DIR, log=None):
+    """
+    Génère les tables names (et celles dont elles dépendent, si elles
+    manquent) dans directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tablebases = Tablebases(directory)
+    todo = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in todo:
+            continue
+        todo.add(name)
+        stack.extend(dependency for dependency in table_dependencies(name)
+                     if dependency not in tablebases.tables)
+    for name in sorted(todo, key=_generation_order):
+        table = generate_table(name, tablebases, log)
+        path = os.path.join(directory, name + TABLE_SUFFIX)
+        with open(path, "wb") as file:
+            file.write(table.data)
+        tablebases.add(table)
+    return sorted(todo, key=_generation_order)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Génère ou consulte les tables de finales à 3 et 4 pièces (analyse rétrograde).")
+    parser.add_argument("--men", type=int, default=3, choices=(3, 4),
+                        help="génère toutes les tables jusqu'à ce nombre de pièces (3 par défaut)")
+    parser.add_argument("--tables", help="tables à générer, ex. KQvKR,KPvK (et leurs dépendances)")
+    parser.add_argument("--directory", default=TABLEBASE_DIR, help="dossier des tables")
+    parser.add_argument("--probe", metavar="FEN", help="affiche le résultat et le meilleur coup d'une position")
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        try:
+            position = Position.from_fen(args.probe)
+        except ValueError as e:
+            print(e)
+            return 1
+        tablebases = Tablebases(args.directory)
+        entry = tablebases.probe(position)
+        if entry is None:
+            print("Position absente des tables")
+            return 1
+        names = {DRAW: "nulle", WIN: "gain", LOSS: "perte"}
+        print(f"{names[entry[0]]}" + (f" (mat en {entry[1]})" if entry[0] != DRAW else ""))
+        best = tablebases.best_move(position)
+        if best:
+            print(f"Meilleur coup: {position.san(best[0])} ({move_to_uci(best[0])})")
+        tablebases.close()
+        return 0
+
+    log = lambda line: print(line, file=sys.stderr)
+    names = args.tables.split(",") if args.tables else all_tables(args.men)
+    try:
+        for name in names:
+            material_types(name)
+    except ValueError:
+        parser.error(f"nom de table invalide: {args.tables}")
+    start = time.perf_counter()
+    generated = generate(names, args.directory, log)
+    print(f"{len(generated)} tables générées dans {args.directory} en {time.perf_counter() - start:.0f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+## EPITECH PROJECT, 2025
+## G-INN-220:chess_ai
+## File description:
+## chess_worker.py
+
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+
+from chess_bitboard import Position
+from chess_engine import TranspositionTable, MoveOrdering, Search, table_entries
+
+# Résultat d'une recherche renvoyé par le processus de calcul; ponder est la
+# réponse attendue de l'adversaire (deuxième coup de la variante principale, 0 si inconnue)
+SearchResult = namedtuple("SearchResult", "move score depth nodes elapsed ponder")
+
+
+def search_result(search):
+    pv = search.pv
+    return SearchResult(search.best_move, search.best_score, search.depth, search.nodes, search.elapsed,
+                        pv[1] if len(pv) > 1 and pv[0] == search.best_move else 0)
+
+
+def default_thread_count():
+    """
+    Nombre de processus de recherche pour les niveaux élevés: variable
+    d'environnement CHESS_AI_THREADS, sinon les cœurs disponibles moins un
+    (laissé à l'interface), au plus 8.
+    """
+    value = os.environ.get("CHESS_AI_THREADS")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            print(f"CHESS_AI_THREADS invalide: {value}")
+    return max(1, min(8, (os.cpu_count() or 1) - 1))
+
+
+def _worker_main(connection, tt_size_mb, shared_table=None, stop_event=None):
+    # Boucle d'un processus de calcul: une requête de recherche à la fois.
+    # La table de transposition et l'ordre des coups (historique) sont gardés
+    # d'un coup à l'autre; en recherche parallèle la table est en mémoire
+    # partagée avec les autres processus.
+    tt = TranspositionTable(tt_size_mb, shared_table)
+    ordering = MoveOrdering()
+    while True:
+        try:
+            request = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if request[0] == "quit":
+            break
+        if request[0] == "ponder":
+            # Recherche de fond sur la position attendue après le coup prévu
+            # de l'adversaire, jusqu'à l'arrêt (stop_event)
+            _, packed, max_depth = request
+            search = Search(Position.unpack(packed), tt, ordering=ordering)
+            start = time.perf_counter()
+            search.search(max_depth, stop_event.is_set)
+            search.elapsed = time.perf_counter() - start
+        elif request[0] == "helper":
+            # Assistant Lazy SMP: même position, même table, jusqu'à ce que
+            # la recherche principale soit terminée. Un assistant sur deux
+            # commence une profondeur plus loin pour désynchroniser les arbres.
+            _, packed, max_depth, helper_id = request
+            search = Search(Position.unpack(packed), tt, ordering=ordering)
+            start = time.perf_counter()
+            search.search(max_depth, stop_event.is_set, 1 + helper_id % 2)
+            search.elapsed = time.perf_counter() - start
+        else:
+            _, packed, soft_time, hard_time, max_depth = request
+            search = Search(Position.unpack(packed), tt, ordering=ordering)
+            search.think(soft_time, hard_time, max_depth)
+        connection.send(search_result(search))
+    connection.close()
+
+
+class SearchWorker:
+    """
+    Moteur de recherche exécuté dans un processus séparé: l'interface garde
+    son cœur (et le GIL) pendant que l'IA réfléchit sur un autre.
+
+    Le processus est lancé à la première recherche et reçoit la position
+    encodée sur 32 octets (Position.pack), jamais le plateau affiché.
+    Si le processus ne peut pas être lancé ou s'arrête, la recherche se fait
+    dans le processus courant.
+
+    Avec threads > 1, la recherche est parallèle (Lazy SMP): threads - 1
+    processus assistants cherchent la même position en même temps que le
+    processus principal et partagent avec lui une table de transposition en
+    mémoire partagée; seul le résultat du processus principal est joué.
+
+    Entre deux recherches, ponder lance une recherche de fond sur la réponse
+    prévue de l'adversaire. La recherche suivante l'arrête: si l'adversaire a
+    joué le coup prévu (ponder_hit), elle repart de la table déjà remplie,
+    voire joue directement le coup trouvé en fond.
+    """
+
+    def __init__(self, tt_size_mb=16, threads=1):
+        self.tt_size_mb = tt_size_mb
+        self.threads = threads
+        self.processes = []
+        self.connections = []
+        self.stop_event = None
+        self.local_tt = None
+        self.local_ordering = None
+        self.pondering = None  # Position (Position.pack) de la recherche de fond
+        self.ponder_hit = False
+
+    def start(self):
+        if self.processes:
+            if len(self.processes) == self.threads:
+                return True
+            # Nombre de processus modifié: on relance le groupe
+            self.close()
+        shared_table = None
+        if self.threads > 1:
+            shared_table = multiprocessing.RawArray("Q", 2 * table_entries(self.tt_size_mb))
+        # Arrêt des assistants et de la recherche de fond
+        self.stop_event = multiprocessing.Event()
+        try:
+            for _ in range(self.threads):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker_main,
+                    args=(child, self.tt_size_mb, shared_table, self.stop_event),
+                    daemon=True)
+                process.start()
+                child.close()
+                self.processes.append(process)
+                self.connections.append(parent)
+        except OSError as e:
+            print(f"Impossible de lancer le processus de l'IA: {e}")
+            self.close()
+            return False
+        return True
+
+    def search(self, position, soft_time, hard_time, max_depth):
+        """
+        Cherche le meilleur coup de position (bloquant) et retourne un
+        SearchResult (nœuds de tous les processus additionnés).
+        """
+        self.ponder_hit = False
+        pondered = None
+        if self.pondering is not None:
+            hit = self.pondering == position.pack()
+            pondered = self.stop_ponder()
+            if hit and pondered is not None and pondered.move:
+                # Coup prévu: le temps de la recherche de fond compte pour ce
+                # coup, et la table est déjà remplie jusqu'à sa profondeur
+                self.ponder_hit = True
+                if pondered.elapsed >= soft_time:
+                    return pondered
+                soft_time -= pondered.elapsed
+                hard_time -= pondered.elapsed
+            else:
+                pondered = None
+        result = None
+        if self.start():
+            try:
+                result = self.search_in_workers(position.pack(), soft_time, hard_time, max_depth)
+            except (EOFError, OSError):
+                print("Le processus de l'IA s'est arrêté, recherche locale")
+                self.close()
+        if result is None:
+            result = self.search_locally(position, soft_time, hard_time, max_depth)
+        if pondered is not None and pondered.depth > result.depth:
+            return pondered
+        return result
+
+    def ponder(self, position, max_depth):
+        """
+        Lance (sans attendre) une recherche de fond sur position, jusqu'à
+        max_depth ou jusqu'à l'arrêt par stop_ponder ou search. Retourne
+        False si les processus de calcul ne sont pas disponibles.
+        """
+        self.stop_ponder()
+        if not self.start():
+            return False
+        packed = position.pack()
+        try:
+            for helper_id, connection in enumerate(self.connections[1:], 1):
+                connection.send(("helper", packed, max_depth, helper_id))
+            self.connections[0].send(("ponder", packed, max_depth))
+        except (OSError, ValueError):
+            print("Le processus de l'IA s'est arrêté")
+            self.close()
+            return False
+        self.pondering = packed
+        return True
+
+    def stop_ponder(self):
+        """
+        Arrête la recherche de fond (les processus vérifient l'arrêt tous les
+        256 nœuds) et retourne son SearchResult, ou None s'il n'y en a pas.
+        """
+        if self.pondering is None:
+            return None
+        self.pondering = None
+        self.stop_event.set()
+        try:
+            result = self.connections[0].recv()
+            nodes = result.nodes
+            for connection in self.connections[1:]:
+                nodes += connection.recv().nodes
+        except (EOFError, OSError):
+            print("Le processus de l'IA s'est arrêté")
+            self.close()
+            return None
+        self.stop_event.clear()
+        return result._replace(nodes=nodes)
+
+    def search_in_workers(self, packed, soft_time, hard_time, max_depth):
+        main, helpers = self.connections[0], self.connections[1:]
+        for helper_id, connection in enumerate(helpers, 1):
+            connection.send(("helper", packed, max_depth, helper_id))
+        main.send(("search", packed, soft_time, hard_time, max_depth))
+        result = main.recv()
+        if not helpers:
+            return result
+        # Arrêter les assistants et compter leurs nœuds
+        self.stop_event.set()
+        nodes = result.nodes
+        for connection in helpers:
+            nodes += connection.recv().nodes
+        self.stop_event.clear()
+        return result._replace(nodes=nodes)
+
+    def search_locally(self, position, soft_time, hard_time, max_depth):
+        # Repli: recherche dans le processus courant, sur une copie de la position
+        if self.local_tt is None:
+            self.local_tt = TranspositionTable(self.tt_size_mb)
+            self.local_ordering = MoveOrdering()
+        search = Search(Position.unpack(position.pack()), self.local_tt, ordering=self.local_ordering)
+        search.think(soft_time, hard_time, max_depth)
+        return search_result(search)
+
+    def close(self):
+        # Arrêter les processus de calcul (une recherche en cours est abandonnée)
+        for connection in self.connections:
+            try:
+                connection.send(("quit",))
+            except (OSError, ValueError):
+                pass
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for process in self.processes:
+            process.join(0.2)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for connection in self.connections:
+            connection.close()
+        self.processes = []
+        self.connections = []
+        self.stop_event = None
+        self.pondering = None
@@ -9,15 +9,10 @@ import pygame
 import sys
 import os
 
-# Créer le dossier assets s'il n'existe pas
-os.makedirs("assets", exist_ok=True)
-
 # Importer les modules de jeu
 import chess_1v1
 import chess_player_vs_ai
-
-# Initialisation de Pygame
-pygame.init()
+from chess_render import wait_events
 
 # Dimensions de la fenêtre
 WINDOW_WIDTH = 600
@@ -32,13 +27,28 @@ DARK_BROWN = (139, 69, 19)
 HOVER_COLOR = (180, 150, 100)
 TEXT_COLOR = (50, 30, 10)
 
-# Création de la fenêtre
-screen = pygame.display.set_mode(WINDOW_SIZE)
-pygame.display.set_caption("Jeu d'Échecs - Menu Principal")
-
-# Police d'écriture
-title_font = pygame.font.SysFont("Arial", 48, bold=True)
-button_font = pygame.font.SysFont("Arial", 28)
+# Fenêtre et polices, créées par init_menu(): importer ce module (par
+# exemple dans un processus de calcul lancé en mode spawn) n'ouvre pas
+# de fenêtre
+screen = None
+title_font = None
+button_font = None
+
+def init_menu():
+    global screen, title_font, button_font
+    # Créer le dossier assets s'il n'existe pas
+    os.makedirs("assets", exist_ok=True)
+    
+    # Initialisation de Pygame
+    pygame.init()
+    
+    # Création de la fenêtre
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    pygame.display.set_caption("Jeu d'Échecs - Menu Principal")
+    
+    # Police d'écriture
+    title_font = pygame.font.SysFont("Arial", 48, bold=True)
+    button_font = pygame.font.SysFont("Arial", 28)
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color):
@@ -95,23 +105,40 @@ buttons = [
 ]
 
 def main_menu():
-    clock = pygame.time.Clock()
+    # Le menu n'est redessiné que si le survol des boutons change; entre deux
+    # événements la boucle dort dans wait_events
+    drawn_state = None
     
     while True:
         mouse_pos = pygame.mouse.get_pos()
         mouse_clicked = False
         
-        for event in pygame.event.get():
+        # Vérifier les survols
+        for button in buttons:
+            button.check_hover(mouse_pos)
+        
+        # Dessiner le menu
+        state = tuple(button.is_hovered for button in buttons)
+        if state != drawn_state:
+            drawn_state = state
+            draw_menu()
+            
+            # Mettre à jour l'affichage
+            pygame.display.flip()
+        
+        for event in wait_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Clic gauche
                     mouse_clicked = True
+                    mouse_pos = event.pos
+            elif event.type == pygame.WINDOWEXPOSED:
+                drawn_state = None
         
-        # Vérifier les survols et les clics de boutons
+        # Vérifier les clics de boutons
         for i, button in enumerate(buttons):
-            button.check_hover(mouse_pos)
             if button.is_clicked(mouse_pos, mouse_clicked):
                 if i == 0:
                     print("Mode 1v1 sélectionné")
@@ -122,16 +149,10 @@ def main_menu():
                 elif i == 2:
                     print("Mode Player vs AI Progressive sélectionné")
                     return "player_vs_ai_progressive"
-        
-        # Dessiner le menu
-        draw_menu()
-        
-        # Mettre à jour l'affichage
-        pygame.display.flip()
-        clock.tick(60)
 
 # Fonction principale
 def main():
+    init_menu()
     running = True
     
     while running: